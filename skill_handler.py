@@ -17,19 +17,50 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-# Add token_craft to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Add token_craft to path (already there when run as a script)
+SKILL_DIR = str(Path(__file__).resolve().parent)
+if SKILL_DIR not in sys.path:
+    sys.path.insert(0, SKILL_DIR)
 
 from token_craft.scoring_engine import TokenCraftScorer
 from token_craft.rank_system import SpaceRankSystem
-from token_craft.user_profile import UserProfile
-from token_craft.snapshot_manager import SnapshotManager
+from token_craft.user_profile import (
+    ACHIEVEMENT_CHECKS,
+    ALL_ACHIEVEMENT_IDS,
+    UserProfile,
+)
+from token_craft.history_loader import HistoryLoader
 from token_craft.delta_calculator import DeltaCalculator
-from token_craft.report_generator import ReportGenerator
-from token_craft.difficulty_modifier import DifficultyModifier
-from token_craft.streak_system import StreakSystem
-from token_craft.achievement_engine import AchievementEngine
-from token_craft.time_based_mechanics import TimeBasedMechanics
+from token_craft.snapshot_manager import SnapshotManager
+
+
+# Quick status templates, built once
+QUICK_STATUS_FORMAT = "{icon} {name} - {score:.0f} points".format
+NEXT_RANK_FORMAT = " ({points_needed} to {name})".format_map
+
+# Menu input (casefolded) -> report mode; None means quit
+MENU_CHOICES = {
+    "1": "v3",
+    "full": "v3",
+    "f": "v3",
+    "v3": "v3",
+    "2": "summary",
+    "summary": "summary",
+    "s": "summary",
+    "3": "quick",
+    "quick": "quick",
+    "o": "quick",
+    "one": "quick",
+    "4": "json",
+    "json": "json",
+    "j": "json",
+    "5": "full",
+    "legacy": "full",
+    "l": "full",
+    "quit": None,
+    "exit": None,
+    "q": None,
+}
 
 
 class TokenCraftHandler:
@@ -37,13 +68,28 @@ class TokenCraftHandler:
 
     def __init__(self):
         """Initialize handler."""
-        self.claude_dir = Path.home() / ".claude"
-        self.history_file = self.claude_dir / "history.jsonl"
-        self.stats_file = self.claude_dir / "stats-cache.json"
+        self.history_loader = HistoryLoader()
+        self.claude_dir = self.history_loader.claude_dir
+        self.history_file = self.history_loader.history_file
+        self.stats_file = self.history_loader.stats_file
 
         self.profile = UserProfile()
+        self._verbose = True
+
+        # Every mode reads the latest snapshot, so build this one up front
         self.snapshot_manager = SnapshotManager()
-        self.report_generator = ReportGenerator()
+
+        # Constructed on first use - quick mode never needs the report generator
+        self._report_generator = None
+
+    @property
+    def report_generator(self):
+        """Lazily constructed ReportGenerator."""
+        if self._report_generator is None:
+            from token_craft.report_generator import ReportGenerator
+
+            self._report_generator = ReportGenerator()
+        return self._report_generator
 
     def load_data(self) -> Tuple[List, Dict]:
         """
@@ -52,31 +98,7 @@ class TokenCraftHandler:
         Returns:
             Tuple of (history_data, stats_data)
         """
-        # Load history.jsonl
-        history_data = []
-        if self.history_file.exists():
-            try:
-                with open(self.history_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            try:
-                                history_data.append(json.loads(line))
-                            except json.JSONDecodeError:
-                                continue
-            except Exception as e:
-                print(f"Warning: Could not load history.jsonl: {e}")
-
-        # Load stats-cache.json
-        stats_data = {}
-        if self.stats_file.exists():
-            try:
-                with open(self.stats_file, "r", encoding="utf-8") as f:
-                    stats_data = json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not load stats-cache.json: {e}")
-
-        return history_data, stats_data
+        return self.history_loader.load()
 
     def calculate_scores(
         self,
@@ -107,19 +129,22 @@ class TokenCraftHandler:
 
         return score_data
 
-    def run(self, mode: str = "full") -> str:
+    def run(self, mode: str = "full", verbose: bool = True) -> str:
         """
         Run the Token-Craft v3.0 analysis.
 
         Args:
             mode: 'full', 'summary', 'quick', or 'v3'
+            verbose: Print progress messages (always off for 'quick')
 
         Returns:
             Formatted report
         """
+        self._verbose = verbose and mode != "quick"
+
         try:
             # Load data
-            print("Loading your data...")
+            self._progress("Loading your data...")
             history_data, stats_data = self.load_data()
 
             if not history_data:
@@ -129,19 +154,17 @@ class TokenCraftHandler:
             previous_snapshot = self.snapshot_manager.get_latest_snapshot()
 
             # Get current rank (for difficulty scaling in v3.0)
-            previous_profile = None
-            if previous_snapshot and isinstance(previous_snapshot, dict):
-                previous_profile = previous_snapshot.get("profile")
+            previous_profile = (
+                previous_snapshot["profile"] if previous_snapshot else None
+            )
 
             current_rank_data = SpaceRankSystem.get_rank(
-                previous_profile.get("total_score", 0)
-                if isinstance(previous_profile, dict)
-                else 0
+                previous_profile.get("total_score", 0) if previous_profile else 0
             )
             current_rank = current_rank_data.get("rank", 1)
 
             # Calculate scores (with v3.0 difficulty scaling)
-            print("Calculating your scores (v3.0 system)...")
+            self._progress("Calculating your scores (v3.0 system)...")
             score_data = self.calculate_scores(
                 history_data, stats_data, previous_profile, user_rank=current_rank
             )
@@ -168,17 +191,23 @@ class TokenCraftHandler:
             # Check for achievements
             self._check_achievements(score_data, rank_data, delta_data)
 
-            # Save profile
-            self.profile.save()
-
-            # Create snapshot
-            print("Saving snapshot...")
-            self.snapshot_manager.create_snapshot(
-                self.profile.get_current_state(), score_data, rank_data
-            )
+            # Quick status is read-only: skip profile and snapshot writes
+            if mode != "quick":
+                # Save profile
+                self.profile.save()
+
+                # Create snapshot (full reports always; otherwise only when
+                # something changed since the last one)
+                if mode in ("full", "v3") or self.snapshot_manager.has_changed(
+                    previous_snapshot, score_data, rank_data
+                ):
+                    self._progress("Saving snapshot...")
+                    self.snapshot_manager.create_snapshot(
+                        self.profile.get_current_state(), score_data, rank_data
+                    )
 
             # Generate report
-            print("Generating report...")
+            self._progress("Generating report...")
             if mode == "summary":
                 report = self.report_generator.generate_summary(
                     self.profile.get_current_state(), score_data, rank_data
@@ -206,73 +235,44 @@ class TokenCraftHandler:
         self, score_data: Dict, rank_data: Dict, delta_data: Optional[Dict]
     ):
         """Check and award achievements."""
-
-        # Helper to safely get achievement IDs
-        def get_achievement_ids():
-            achievements = self.profile.get_achievements()
-            if not achievements:
-                return set()
-            # Filter out non-dict items and extract IDs
-            return {a["id"] for a in achievements if isinstance(a, dict) and "id" in a}
-
-        achievement_ids = get_achievement_ids()
-
-        # First rank achievement
-        if rank_data["name"] == "Pilot" and "first_pilot" not in achievement_ids:
-            self.profile.add_achievement(
-                "first_pilot", "First Pilot", "Achieved Pilot rank for the first time"
-            )
-
-        # Score milestones
-        score = score_data["total_score"]
-        if score >= 500 and "halfway_there" not in achievement_ids:
-            self.profile.add_achievement(
-                "halfway_there", "Halfway There", "Reached 500 points"
-            )
-
-        if score >= 1000 and "four_digits" not in achievement_ids:
-            self.profile.add_achievement(
-                "four_digits", "Four Digits", "Reached 1000+ points (Admiral level)"
-            )
-
-        # Efficiency achievement
-        efficiency_data = score_data["breakdown"].get("token_efficiency", {})
-        efficiency_pct = (
-            efficiency_data.get("improvement_pct", 0)
-            if isinstance(efficiency_data, dict)
-            else 0
-        )
-        if efficiency_pct >= 30 and "efficiency_master" not in achievement_ids:
-            self.profile.add_achievement(
-                "efficiency_master",
-                "Efficiency Master",
-                "Achieved 30%+ better efficiency than baseline",
-            )
-
-        # Promotion achievement
-        if delta_data and isinstance(delta_data, dict):
-            rank_change = delta_data.get("rank_change")
-            if (
-                rank_change
-                and isinstance(rank_change, dict)
-                and rank_change.get("promoted")
-            ):
+        owned = self.profile.owned_ids()
+
+        # Veterans own every fixed achievement; skip evaluating the rules
+        if not ALL_ACHIEVEMENT_IDS <= owned:
+            for achievement_id, title, description, condition in ACHIEVEMENT_CHECKS:
+                if achievement_id not in owned and condition(score_data, rank_data):
+                    self.profile.add_achievement(achievement_id, title, description)
+
+        # Promotion achievement (ID depends on the new rank)
+        # DeltaCalculator sets rank_change to None or a dict with "promoted"
+        if delta_data:
+            rank_change = delta_data["rank_change"]
+            if rank_change and rank_change["promoted"]:
                 promo_id = f"promoted_to_{rank_data['name'].lower()}"
-                if promo_id not in achievement_ids:
+                if promo_id not in owned:
                     self.profile.add_achievement(
                         promo_id,
                         f"Promoted to {rank_data['name']}",
                         f"Achieved {rank_data['name']} rank",
                     )
 
+    def _progress(self, message: str) -> None:
+        """Print a progress message unless running quietly."""
+        if self._verbose:
+            print(message)
+
     def _generate_quick_status(self, score_data: Dict, rank_data: Dict) -> str:
         """Generate quick one-line status."""
         next_rank = SpaceRankSystem.get_next_rank(score_data["total_score"])
 
-        status = f"{rank_data['icon']} {rank_data['name']} - {score_data['total_score']:.0f} points"
+        status = QUICK_STATUS_FORMAT(
+            icon=rank_data["icon"],
+            name=rank_data["name"],
+            score=score_data["total_score"],
+        )
 
         if next_rank:
-            status += f" ({next_rank['points_needed']} to {next_rank['name']})"
+            status += NEXT_RANK_FORMAT(next_rank)
 
         return status
 
@@ -423,22 +423,12 @@ def show_menu():
     print("\n" + "=" * 70)
 
     while True:
-        choice = input("\nYour choice: ").strip().upper()
-
-        if choice in ["1", "FULL", "F", "V3"]:
-            return "v3"
-        elif choice in ["2", "SUMMARY", "S"]:
-            return "summary"
-        elif choice in ["3", "QUICK", "O", "ONE"]:
-            return "quick"
-        elif choice in ["4", "JSON", "J"]:
-            return "json"
-        elif choice in ["5", "LEGACY", "L"]:
-            return "full"
-        elif choice in ["QUIT", "EXIT", "Q"]:
-            return None
-        else:
-            print("❌ Invalid choice. Please select 1, 2, 3, 4, 5, or Q.")
+        choice = input("\nYour choice: ").strip().casefold()
+
+        if choice in MENU_CHOICES:
+            return MENU_CHOICES[choice]
+
+        print("❌ Invalid choice. Please select 1, 2, 3, 4, 5, or Q.")
 
 
 def main():
@@ -465,7 +455,8 @@ def main():
     handler = TokenCraftHandler()
 
     if mode == "json":
-        report = handler.run(mode="v3")
+        # Progress lines would corrupt the JSON document on stdout
+        report = handler.run(mode="v3", verbose=False)
         output = {"profile": handler.profile.get_current_state(), "report": report}
         print(json.dumps(output, indent=2))
     else:
@@ -5,17 +5,25 @@ Main entry point with all features: leaderboards, team export, hero badges, inte
 Supports v3.0 gamification with difficulty scaling, streaks, achievements, and regression detection.
 """
 
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-# Add token_craft to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Add token_craft to path (already there when run as a script)
+SKILL_DIR = str(Path(__file__).resolve().parent)
+if SKILL_DIR not in sys.path:
+    sys.path.insert(0, SKILL_DIR)
 
 from token_craft.scoring_engine import TokenCraftScorer
 from token_craft.rank_system import SpaceRankSystem
-from token_craft.user_profile import UserProfile
+from token_craft.user_profile import (
+    ACHIEVEMENT_CHECKS,
+    ALL_ACHIEVEMENT_IDS,
+    UserProfile,
+)
+from token_craft.history_loader import HistoryLoader
 from token_craft.snapshot_manager import SnapshotManager
 from token_craft.delta_calculator import DeltaCalculator
 from token_craft.report_generator import ReportGenerator
@@ -36,16 +44,15 @@ class TokenCraftHandlerFull:
 
     def __init__(self):
         """Initialize handler with all components."""
-        self.claude_dir = Path.home() / ".claude"
-        self.history_file = self.claude_dir / "history.jsonl"
-        self.stats_file = self.claude_dir / "stats-cache.json"
+        self.history_loader = HistoryLoader()
+        self.claude_dir = self.history_loader.claude_dir
+        self.history_file = self.history_loader.history_file
+        self.stats_file = self.history_loader.stats_file
 
         self.profile = UserProfile()
         self.snapshot_manager = SnapshotManager()
         self.report_generator = ReportGenerator()
-        self.leaderboard_generator = LeaderboardGenerator()
         self.hero_client = MockHeroClient()
-        self.team_exporter = TeamExporter()
         self.recommendation_engine = RecommendationEngine()
         self.menu = InteractiveMenu()
 
@@ -54,31 +61,19 @@ class TokenCraftHandlerFull:
         self.current_rank_data = None
         self.current_recommendations = None
 
-    def load_data(self) -> tuple:
-        """Load history and stats data."""
-        history_data = []
-        if self.history_file.exists():
-            try:
-                with open(self.history_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            try:
-                                history_data.append(json.loads(line))
-                            except json.JSONDecodeError:
-                                continue
-            except Exception as e:
-                print(f"Warning: Could not load history.jsonl: {e}")
+    @cached_property
+    def leaderboard_generator(self) -> LeaderboardGenerator:
+        """Leaderboard generator, created on first use of the leaderboard menu."""
+        return LeaderboardGenerator()
 
-        stats_data = {}
-        if self.stats_file.exists():
-            try:
-                with open(self.stats_file, "r", encoding="utf-8") as f:
-                    stats_data = json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not load stats-cache.json: {e}")
+    @cached_property
+    def team_exporter(self) -> TeamExporter:
+        """Exporter for the default directory, created on first use."""
+        return TeamExporter()
 
-        return history_data, stats_data
+    def load_data(self) -> tuple:
+        """Load history and stats data."""
+        return self.history_loader.load()
 
     def calculate_scores(
         self,
@@ -129,9 +124,9 @@ class TokenCraftHandlerFull:
             previous_snapshot = self.snapshot_manager.get_latest_snapshot()
 
             # Calculate current rank for v3.0 difficulty scaling
-            previous_profile = None
-            if previous_snapshot and isinstance(previous_snapshot, dict):
-                previous_profile = previous_snapshot.get("profile")
+            previous_profile = (
+                previous_snapshot["profile"] if previous_snapshot else None
+            )
 
             previous_score = (
                 previous_profile.get("total_score", 0) if previous_profile else 0
@@ -173,9 +168,6 @@ class TokenCraftHandlerFull:
                 self.current_score_data, self.current_rank_data, delta_data
             )
 
-            # Sync with hero.epam.com
-            self._sync_hero_badges()
-
             # Generate recommendations
             self.current_recommendations = (
                 self.recommendation_engine.generate_recommendations(
@@ -183,14 +175,22 @@ class TokenCraftHandlerFull:
                 )
             )
 
-            # Save profile and snapshot
-            self.profile.save()
+            # Sync with hero.epam.com and save profile and snapshot. These
+            # only read the finished analysis, so their I/O can overlap.
             print("Saving snapshot...")
-            self.snapshot_manager.create_snapshot(
-                self.profile.get_current_state(),
-                self.current_score_data,
-                self.current_rank_data,
-            )
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [
+                    executor.submit(self._sync_hero_badges),
+                    executor.submit(self.profile.save),
+                    executor.submit(
+                        self.snapshot_manager.create_snapshot,
+                        self.profile.get_current_state(),
+                        self.current_score_data,
+                        self.current_rank_data,
+                    ),
+                ]
+                for future in futures:
+                    future.result()
 
             return True
 
@@ -520,52 +520,21 @@ class TokenCraftHandlerFull:
         self, score_data: Dict, rank_data: Dict, delta_data: Optional[Dict]
     ):
         """Check and award achievements."""
-        # Existing achievements from basic handler
-        if rank_data["name"] == "Pilot" and not any(
-            a["id"] == "first_pilot" for a in self.profile.get_achievements()
-        ):
-            self.profile.add_achievement(
-                "first_pilot", "First Pilot", "Achieved Pilot rank for the first time"
-            )
-
-        score = score_data["total_score"]
-        if score >= 500 and not any(
-            a["id"] == "halfway_there" for a in self.profile.get_achievements()
-        ):
-            self.profile.add_achievement(
-                "halfway_there", "Halfway There", "Reached 500 points"
-            )
-
-        if score >= 1000 and not any(
-            a["id"] == "four_digits" for a in self.profile.get_achievements()
-        ):
-            self.profile.add_achievement(
-                "four_digits", "Four Digits", "Reached 1000+ points (Admiral level)"
-            )
-
-        efficiency_pct = score_data["breakdown"]["token_efficiency"].get(
-            "improvement_pct", 0
-        )
-        if efficiency_pct >= 30 and not any(
-            a["id"] == "efficiency_master" for a in self.profile.get_achievements()
-        ):
-            self.profile.add_achievement(
-                "efficiency_master",
-                "Efficiency Master",
-                "Achieved 30%+ better efficiency than baseline",
-            )
-
-        if delta_data and isinstance(delta_data, dict):
-            rank_change = delta_data.get("rank_change")
-            if (
-                rank_change
-                and isinstance(rank_change, dict)
-                and rank_change.get("promoted")
-            ):
+        owned = self.profile.owned_ids()
+
+        # Veterans own every fixed achievement; skip evaluating the rules
+        if not ALL_ACHIEVEMENT_IDS <= owned:
+            for achievement_id, title, description, condition in ACHIEVEMENT_CHECKS:
+                if achievement_id not in owned and condition(score_data, rank_data):
+                    self.profile.add_achievement(achievement_id, title, description)
+
+        # Promotion achievement (ID depends on the new rank)
+        # DeltaCalculator sets rank_change to None or a dict with "promoted"
+        if delta_data:
+            rank_change = delta_data["rank_change"]
+            if rank_change and rank_change["promoted"]:
                 promo_id = f"promoted_to_{rank_data['name'].lower()}"
-                if not any(
-                    a["id"] == promo_id for a in self.profile.get_achievements()
-                ):
+                if promo_id not in owned:
                     self.profile.add_achievement(
                         promo_id,
                         f"Promoted to {rank_data['name']}",
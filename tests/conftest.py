@@ -0,0 +1,22 @@
+"""
+pytest configuration shared by all test modules.
+
+Puts the repository root on sys.path once per session so test modules can
+import token_craft without editing sys.path themselves.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = str(Path(__file__).resolve().parent.parent)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line(
+        "markers",
+        "slow: touches the filesystem or spawns a subprocess "
+        '(deselect with -m "not slow")',
+    )
@@ -13,14 +13,23 @@ Tests cover:
 - Verify max achievable score = 2300 pts
 """
 
+import functools
 import unittest
+import subprocess
+import statistics
 import sys
+import tempfile
 from pathlib import Path
+from types import MappingProxyType
+from unittest import mock
 from datetime import datetime, timedelta
 import json
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+
+# Run directly (python tests/test_scoring.py), conftest.py is not loaded
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from token_craft.scoring_engine import TokenCraftScorer
 from token_craft.rank_system import SpaceRankSystem
@@ -30,6 +39,30 @@ from token_craft.achievement_engine import AchievementEngine
 from token_craft.time_based_mechanics import TimeBasedMechanics
 from token_craft.migration_engine import MigrationEngine
 from token_craft.user_profile import UserProfile
+from token_craft.snapshot_manager import SnapshotManager
+from token_craft.delta_calculator import DeltaCalculator
+from token_craft.recommendation_tracker import RecommendationTracker
+from token_craft.pattern_library import PatternLibrary
+from token_craft.experimentation import ExperimentationFramework
+from token_craft.session_analyzer import SessionAnalyzer
+from token_craft.pricing_calculator import PricingCalculator
+from token_craft._jsonio import dumps, loads
+from token_craft import history_loader
+from token_craft.history_loader import HistoryLoader
+
+# The ten v3.0 scoring categories
+V3_CATEGORIES = (
+    "token_efficiency",
+    "optimization_adoption",
+    "improvement_trend",
+    "best_practices",
+    "cache_effectiveness",
+    "tool_efficiency",
+    "session_focus",
+    "cost_efficiency",
+    "learning_growth",
+    "waste_awareness",
+)
 
 
 class TestSpaceRankSystem(unittest.TestCase):
@@ -54,59 +87,32 @@ class TestSpaceRankSystem(unittest.TestCase):
         actual_names = [r["name"] for r in all_ranks]
         self.assertEqual(actual_names, expected_names)
 
-    def test_get_rank_cadet(self):
-        """Test Cadet rank (0-99 pts)."""
-        rank = SpaceRankSystem.get_rank(50)
-        self.assertEqual(rank["name"], "Cadet")
-        self.assertEqual(rank["min"], 0)
-        self.assertEqual(rank["max"], 99)
-
-    def test_get_rank_navigator(self):
-        """Test Navigator rank (100-199 pts)."""
-        rank = SpaceRankSystem.get_rank(150)
-        self.assertEqual(rank["name"], "Navigator")
-
-    def test_get_rank_pilot(self):
-        """Test Pilot rank (200-349 pts)."""
-        rank = SpaceRankSystem.get_rank(250)
-        self.assertEqual(rank["name"], "Pilot")
-
-    def test_get_rank_explorer(self):
-        """Test Explorer rank (350-549 pts)."""
-        rank = SpaceRankSystem.get_rank(450)
-        self.assertEqual(rank["name"], "Explorer")
-
-    def test_get_rank_captain(self):
-        """Test Captain rank (550-799 pts)."""
-        rank = SpaceRankSystem.get_rank(650)
-        self.assertEqual(rank["name"], "Captain")
-
-    def test_get_rank_commander(self):
-        """Test Commander rank (800-1099 pts)."""
-        rank = SpaceRankSystem.get_rank(900)
-        self.assertEqual(rank["name"], "Commander")
-
-    def test_get_rank_admiral(self):
-        """Test Admiral rank (1100-1449 pts)."""
-        rank = SpaceRankSystem.get_rank(1200)
-        self.assertEqual(rank["name"], "Admiral")
-
-    def test_get_rank_commodore(self):
-        """Test Commodore rank (1450-1849 pts)."""
-        rank = SpaceRankSystem.get_rank(1650)
-        self.assertEqual(rank["name"], "Commodore")
-
-    def test_get_rank_fleet_admiral(self):
-        """Test Fleet Admiral rank (1850-2299 pts)."""
-        rank = SpaceRankSystem.get_rank(2000)
-        self.assertEqual(rank["name"], "Fleet Admiral")
-
-    def test_get_rank_legend(self):
-        """Test Galactic Legend rank (2300+ pts)."""
-        rank = SpaceRankSystem.get_rank(2300)
-        self.assertEqual(rank["name"], "Galactic Legend")
-        rank = SpaceRankSystem.get_rank(5000)
-        self.assertEqual(rank["name"], "Galactic Legend")
+    # (points, name, min, max, level) covering every rank
+    RANK_TABLE = (
+        (50, "Cadet", 0, 99, 1),
+        (99.5, "Cadet", 0, 99, 1),
+        (150, "Navigator", 100, 199, 2),
+        (250, "Pilot", 200, 349, 3),
+        (450, "Explorer", 350, 549, 4),
+        (650, "Captain", 550, 799, 5),
+        (900, "Commander", 800, 1099, 6),
+        (1200, "Admiral", 1100, 1449, 7),
+        (1650, "Commodore", 1450, 1849, 8),
+        (2000, "Fleet Admiral", 1850, 2299, 9),
+        (2299.5, "Fleet Admiral", 1850, 2299, 9),
+        (2300, "Galactic Legend", 2300, 9999, 10),
+        (5000, "Galactic Legend", 2300, 9999, 10),
+        (12000, "Galactic Legend", 2300, 9999, 10),
+    )
+
+    def test_get_rank_and_level(self):
+        """Test rank lookup and numeric level (1-10) across all ranks."""
+        for points, name, rank_min, rank_max, level in self.RANK_TABLE:
+            with self.subTest(points=points):
+                rank = SpaceRankSystem.get_rank(points)
+                self.assertEqual(rank["name"], name)
+                self.assertEqual((rank["min"], rank["max"]), (rank_min, rank_max))
+                self.assertEqual(SpaceRankSystem.calculate_rank_level(points), level)
 
     def test_rank_progress_percentage(self):
         """Test progress percentage within rank."""
@@ -115,24 +121,23 @@ class TestSpaceRankSystem(unittest.TestCase):
         self.assertGreaterEqual(rank["progress_pct"], 0)
         self.assertLessEqual(rank["progress_pct"], 100)
 
-    def test_get_next_rank(self) -> None:
-        """Test next rank calculation."""
-        next_rank = SpaceRankSystem.get_next_rank(150)
-        assert next_rank is not None
-        self.assertEqual(next_rank["name"], "Pilot")
-        self.assertEqual(next_rank["points_needed"], 50)
-
-    def test_get_next_rank_from_pilot(self) -> None:
-        """Test next rank from Pilot."""
-        next_rank = SpaceRankSystem.get_next_rank(250)
-        assert next_rank is not None
-        self.assertEqual(next_rank["name"], "Explorer")
-        self.assertEqual(next_rank["points_needed"], 100)
-
-    def test_get_next_rank_max(self):
-        """Test next rank at max level."""
-        next_rank = SpaceRankSystem.get_next_rank(2300)
-        self.assertIsNone(next_rank)
+    # (points, next rank name or None at the top, points needed)
+    NEXT_RANK_TABLE = (
+        (150, "Pilot", 50),
+        (250, "Explorer", 100),
+        (2300, None, None),
+    )
+
+    def test_get_next_rank(self):
+        """Test next rank calculation, including None at max level."""
+        for points, name, points_needed in self.NEXT_RANK_TABLE:
+            with self.subTest(points=points):
+                next_rank = SpaceRankSystem.get_next_rank(points)
+                if name is None:
+                    self.assertIsNone(next_rank)
+                    continue
+                self.assertEqual(next_rank["name"], name)
+                self.assertEqual(next_rank["points_needed"], points_needed)
 
     def test_progress_bar(self):
         """Test progress bar generation."""
@@ -141,20 +146,9 @@ class TestSpaceRankSystem(unittest.TestCase):
         self.assertIn("█", bar)
         self.assertIn("░", bar)
 
-    def test_rank_level(self):
-        """Test numeric rank level (1-10)."""
-        self.assertEqual(SpaceRankSystem.calculate_rank_level(50), 1)  # Cadet
-        self.assertEqual(SpaceRankSystem.calculate_rank_level(150), 2)  # Navigator
-        self.assertEqual(SpaceRankSystem.calculate_rank_level(250), 3)  # Pilot
-        self.assertEqual(SpaceRankSystem.calculate_rank_level(450), 4)  # Explorer
-        self.assertEqual(SpaceRankSystem.calculate_rank_level(650), 5)  # Captain
-        self.assertEqual(SpaceRankSystem.calculate_rank_level(900), 6)  # Commander
-        self.assertEqual(SpaceRankSystem.calculate_rank_level(1200), 7)  # Admiral
-        self.assertEqual(SpaceRankSystem.calculate_rank_level(1650), 8)  # Commodore
-        self.assertEqual(SpaceRankSystem.calculate_rank_level(2000), 9)  # Fleet Admiral
-        self.assertEqual(
-            SpaceRankSystem.calculate_rank_level(2300), 10
-        )  # Galactic Legend
+        # Above 100 the bar shows progress through the current rank
+        self.assertEqual(SpaceRankSystem.get_progress_bar(150, width=10), "█████░░░░░")
+        self.assertEqual(SpaceRankSystem.get_progress_bar(325, 4, "#", "-"), "###-")
 
     def test_get_rank_by_name(self) -> None:
         """Test getting rank by name."""
@@ -165,13 +159,48 @@ class TestSpaceRankSystem(unittest.TestCase):
         self.assertEqual(rank["min"], 550)
         self.assertEqual(rank["max"], 799)
 
+        fleet_admiral = SpaceRankSystem.get_rank_by_name("fleet ADMIRAL")
+        self.assertIs(fleet_admiral, SpaceRankSystem.RANKS[8])
+        self.assertIsNone(SpaceRankSystem.get_rank_by_name("Ensign"))
+
+    def test_rank_badge_ascii(self):
+        """Test badges render for exact rank names only."""
+        badge = SpaceRankSystem.get_rank_badge_ascii("Pilot")
+        self.assertEqual(badge.splitlines()[1], "  ✈️  PILOT  ✈️")
+        self.assertEqual(badge.splitlines()[0], "=" * 20)
+
+        self.assertEqual(SpaceRankSystem.get_rank_badge_ascii("pilot"), "")
+        self.assertEqual(SpaceRankSystem.get_rank_badge_ascii("Ensign"), "")
+
+    def test_cached_rank_results_are_copies(self):
+        """Test mutating a returned rank dict does not poison the cache."""
+        rank = SpaceRankSystem.get_rank(612.5)
+        rank["name"] = "Mutated"
+        next_rank = SpaceRankSystem.get_next_rank(612.5)
+        next_rank["points_needed"] = -1
+
+        self.assertEqual(SpaceRankSystem.get_rank(612.5)["name"], "Captain")
+        self.assertEqual(SpaceRankSystem.get_next_rank(612.5)["points_needed"], 187.5)
+
+    def test_cache_keeps_int_and_float_scores_apart(self):
+        """Test an int score never gets the result cached for an equal float."""
+        for score in (500.0, 500):
+            with self.subTest(score=score):
+                rank = SpaceRankSystem.get_rank(score)
+                next_rank = SpaceRankSystem.get_next_rank(score)
+
+                self.assertIs(type(rank["current_score"]), type(score))
+                self.assertIs(type(rank["progress_in_rank"]), type(score))
+                self.assertIs(type(next_rank["points_needed"]), type(score))
+
 
 class TestTokenCraftScorerV3(unittest.TestCase):
     """Test v3.0 scoring engine with new features."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.history_data = [
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data and one scorer shared by the read-only tests."""
+        cls.history_data = [
             {
                 "sessionId": "session1",
                 "project": "project_a",
@@ -192,86 +221,72 @@ class TestTokenCraftScorerV3(unittest.TestCase):
             },
         ]
 
-        self.stats_data = {
-            "models": {
-                "claude-sonnet-4.5": {"inputTokens": 50000, "outputTokens": 30000}
+        # Read-only views: a test that mutates shared input fails loudly
+        cls.stats_data = MappingProxyType(
+            {
+                "models": MappingProxyType(
+                    {"claude-sonnet-4.5": {"inputTokens": 50000, "outputTokens": 30000}}
+                )
             }
-        }
+        )
 
         # Create sample user profile for v3.0
-        self.user_profile_v3 = {
-            "version": "3.0",
-            "user_email": "user@example.com",
-            "current_rank": "Cadet",
-            "current_score": 0,
-            "total_sessions": 1,
-            "total_tokens": 80000,
-            "scores": {
-                "token_efficiency": 0,
-                "optimization_adoption": 0,
-                "improvement_trend": 0,
-                "best_practices": 0,
-                "cache_effectiveness": 0,
-                "tool_efficiency": 0,
-                "session_focus": 0,
-                "cost_efficiency": 0,
-                "learning_growth": 0,
-                "waste_awareness": 0,
-            },
-            "streak_info": {
-                "current": {"length": 0, "start_date": None, "last_session_date": None},
-                "best": {"length": 0, "start_date": None, "last_session_date": None},
-            },
-            "seasonal_info": {
-                "current_season_score": 0,
-                "lifetime_score": 0,
-                "current_season_start": datetime.now().isoformat(),
-                "last_reset": None,
-            },
-            "achievements": [],
-        }
+        cls.user_profile_v3 = MappingProxyType(
+            {
+                "version": "3.0",
+                "user_email": "user@example.com",
+                "current_rank": "Cadet",
+                "current_score": 0,
+                "total_sessions": 1,
+                "total_tokens": 80000,
+                "scores": dict.fromkeys(V3_CATEGORIES, 0),
+                "streak_info": {
+                    "current": {
+                        "length": 0,
+                        "start_date": None,
+                        "last_session_date": None,
+                    },
+                    "best": {
+                        "length": 0,
+                        "start_date": None,
+                        "last_session_date": None,
+                    },
+                },
+                "seasonal_info": {
+                    "current_season_score": 0,
+                    "lifetime_score": 0,
+                    "current_season_start": datetime.now().isoformat(),
+                    "last_reset": None,
+                },
+                "achievements": [],
+            }
+        )
 
-    def test_scorer_initialization_v3(self):
-        """Test scorer initialization with v3.0."""
-        scorer = TokenCraftScorer(
-            self.history_data,
-            self.stats_data,
+        # Scoring methods only read scorer state, so construct it once
+        cls.scorer = TokenCraftScorer(
+            cls.history_data,
+            cls.stats_data,
             rank=1,
-            user_profile=self.user_profile_v3,
+            user_profile=cls.user_profile_v3,
         )
-        self.assertIsNotNone(scorer)
-        self.assertEqual(scorer.total_sessions, 2)
-        self.assertEqual(scorer.total_tokens, 80000)
+
+    def test_scorer_initialization_v3(self):
+        """Test scorer initialization with v3.0."""
+        self.assertIsNotNone(self.scorer)
+        self.assertEqual(self.scorer.total_sessions, 2)
+        self.assertEqual(self.scorer.total_tokens, 80000)
 
     def test_no_self_sufficiency_in_weights(self):
         """Test that self_sufficiency is removed from v3.0 weights."""
-        scorer = TokenCraftScorer(
-            self.history_data,
-            self.stats_data,
-            rank=1,
-            user_profile=self.user_profile_v3,
-        )
-        self.assertNotIn("self_sufficiency", scorer.weights)
+        self.assertNotIn("self_sufficiency", self.scorer.weights)
 
     def test_waste_awareness_category_exists(self):
         """Test that waste_awareness is a new v3.0 category."""
-        scorer = TokenCraftScorer(
-            self.history_data,
-            self.stats_data,
-            rank=1,
-            user_profile=self.user_profile_v3,
-        )
-        self.assertIn("waste_awareness", scorer.weights)
+        self.assertIn("waste_awareness", self.scorer.weights)
 
     def test_smooth_token_efficiency_scale(self):
         """Test smooth logarithmic scale for token efficiency (not tiers)."""
-        scorer = TokenCraftScorer(
-            self.history_data,
-            self.stats_data,
-            rank=1,
-            user_profile=self.user_profile_v3,
-        )
-        score_data = scorer.calculate_token_efficiency_score()
+        score_data = self.scorer.calculate_token_efficiency_score()
 
         # Should be smooth, not discrete tiers
         self.assertIn("score", score_data)
@@ -284,14 +299,7 @@ class TestTokenCraftScorerV3(unittest.TestCase):
 
     def test_linear_cache_effectiveness_scale(self):
         """Test linear scale for cache effectiveness."""
-        # Create scorer with cache data
-        scorer = TokenCraftScorer(
-            self.history_data,
-            self.stats_data,
-            rank=1,
-            user_profile=self.user_profile_v3,
-        )
-        score_data = scorer.calculate_cache_effectiveness_score()
+        score_data = self.scorer.calculate_cache_effectiveness_score()
 
         self.assertIn("score", score_data)
         self.assertEqual(score_data["max_score"], 75)  # v3.0 value (was 100)
@@ -303,13 +311,7 @@ class TestTokenCraftScorerV3(unittest.TestCase):
     def test_learning_growth_no_warmup_bonus(self):
         """Test learning growth removes warm-up bonus."""
         # With <10 sessions, should not get auto 25pts
-        scorer = TokenCraftScorer(
-            self.history_data,
-            self.stats_data,
-            rank=1,
-            user_profile=self.user_profile_v3,
-        )
-        score_data = scorer.calculate_learning_growth_score()
+        score_data = self.scorer.calculate_learning_growth_score()
 
         self.assertIn("score", score_data)
         self.assertEqual(score_data["max_score"], 75)
@@ -319,13 +321,7 @@ class TestTokenCraftScorerV3(unittest.TestCase):
 
     def test_total_score_v3_max(self):
         """Test total score max is 2300 (not 1450)."""
-        scorer = TokenCraftScorer(
-            self.history_data,
-            self.stats_data,
-            rank=1,
-            user_profile=self.user_profile_v3,
-        )
-        score_data = scorer.calculate_total_score()
+        score_data = self.scorer.calculate_total_score()
 
         self.assertIn("total_score", score_data)
         self.assertIn("max_achievable", score_data)
@@ -338,34 +334,27 @@ class TestTokenCraftScorerV3(unittest.TestCase):
 
     def test_breakdown_has_10_categories(self):
         """Test breakdown contains all 10 v3.0 categories."""
-        scorer = TokenCraftScorer(
-            self.history_data,
-            self.stats_data,
-            rank=1,
-            user_profile=self.user_profile_v3,
-        )
-        score_data = scorer.calculate_total_score()
+        score_data = self.scorer.calculate_total_score()
 
         breakdown = score_data.get("breakdown", {})
-        expected_categories = [
-            "token_efficiency",
-            "optimization_adoption",
-            "improvement_trend",
-            "waste_awareness",
-            "best_practices",
-            "cache_effectiveness",
-            "tool_efficiency",
-            "session_focus",
-            "cost_efficiency",
-            "learning_growth",
-        ]
 
-        for cat in expected_categories:
-            self.assertIn(cat, breakdown, f"Missing category: {cat}")
+        missing = set(V3_CATEGORIES) - breakdown.keys()
+        self.assertFalse(missing, f"Missing categories: {sorted(missing)}")
 
         # self_sufficiency should NOT be in breakdown
         self.assertNotIn("self_sufficiency", breakdown)
 
+    def test_sample_stdev_matches_statistics(self):
+        """Test float stdev helper agrees with statistics.stdev."""
+        import statistics
+        from token_craft.scoring_engine import _sample_stdev
+
+        values = [120, 80, 4000, 15, 15, 900, 33]
+        mean = statistics.fmean(values)
+        self.assertAlmostEqual(
+            _sample_stdev(values, mean), statistics.stdev(values), places=9
+        )
+
 
 class TestDifficultyModifier(unittest.TestCase):
     """Test rank-based difficulty scaling."""
@@ -482,18 +471,20 @@ class TestComboBonus(unittest.TestCase):
         self.assertEqual(max_tier["categories_min"], 5)
         self.assertEqual(max_tier["bonus_points"], 150)
 
-    def test_combo_calculation(self):
-        """Test calculating combo bonus from categories."""
-        # Score data with 3 categories at 80%+
-        scores = {
+    # Read-only breakdown with 3 categories at 80%+, built once per session
+    COMBO_SCORES = MappingProxyType(
+        {
             "token_efficiency": {"score": 200, "max_score": 250},  # 80%
             "optimization_adoption": {"score": 320, "max_score": 400},  # 80%
             "improvement_trend": {"score": 100, "max_score": 125},  # 80%
             "best_practices": {"score": 30, "max_score": 50},  # 60%
             "cache_effectiveness": {"score": 40, "max_score": 75},  # 53%
         }
+    )
 
-        combo_bonus = ComboBonus.calculate_combo_bonus(scores)
+    def test_combo_calculation(self):
+        """Test calculating combo bonus from categories."""
+        combo_bonus = ComboBonus.calculate_combo_bonus(self.COMBO_SCORES)
         self.assertGreater(combo_bonus, 0)
 
 
@@ -507,28 +498,29 @@ class TestAchievementEngine(unittest.TestCase):
 
     def test_achievements_have_required_fields(self):
         """Test each achievement has required fields."""
-        for ach in AchievementEngine.ACHIEVEMENTS:
-            self.assertIn("id", ach)
-            self.assertIn("title", ach)
-            self.assertIn("description", ach)
-            self.assertIn("category", ach)
-            self.assertIn("threshold", ach)
+        required = {"id", "title", "description", "category", "threshold"}
+        incomplete = [
+            (ach.get("id"), sorted(required - ach.keys()))
+            for ach in AchievementEngine.ACHIEVEMENTS
+            if not required <= ach.keys()
+        ]
+        self.assertEqual(incomplete, [])
 
     def test_achievement_categories(self):
         """Test achievements cover multiple categories."""
         achievements = AchievementEngine.ACHIEVEMENTS
         categories = set(a["category"] for a in achievements)
 
-        expected_categories = [
+        expected_categories = {
             "progression",
             "excellence",
             "streaks",
             "combos",
             "exploration",
             "special",
-        ]
-        for cat in expected_categories:
-            self.assertIn(cat, categories)
+        }
+        missing = expected_categories - categories
+        self.assertFalse(missing, f"Missing categories: {sorted(missing)}")
 
     def test_unlock_achievement(self):
         """Test unlocking achievement."""
@@ -744,17 +736,23 @@ class TestMigrationEngine(unittest.TestCase):
         self.assertIn("message", report)
 
 
+@functools.lru_cache(maxsize=None)
+def _empty_scorer(rank=1):
+    """Scorer with no history, built once; tests only read its weights."""
+    return TokenCraftScorer([], {}, rank=rank)
+
+
 class TestWasteAwarenessSystem(unittest.TestCase):
     """Test new waste awareness scoring category."""
 
     def test_waste_awareness_exists(self):
         """Test waste_awareness is available in scorer."""
-        scorer = TokenCraftScorer([], {}, rank=1)
+        scorer = _empty_scorer()
         self.assertIn("waste_awareness", scorer.weights)
 
     def test_waste_awareness_max_score(self):
         """Test waste_awareness max score is 100."""
-        scorer = TokenCraftScorer([], {}, rank=1)
+        scorer = _empty_scorer()
         self.assertEqual(scorer.weights.get("waste_awareness"), 100)
 
 
@@ -763,7 +761,7 @@ class TestV3MaxScore(unittest.TestCase):
 
     def test_base_categories_total_2300(self):
         """Test base scoring categories total to ~2300."""
-        scorer = TokenCraftScorer([], {}, rank=1)
+        scorer = _empty_scorer()
 
         base_total = sum(scorer.weights.values())
 
@@ -773,7 +771,7 @@ class TestV3MaxScore(unittest.TestCase):
 
     def test_bonus_categories_exist(self):
         """Test bonus categories are defined for additional points."""
-        scorer = TokenCraftScorer([], {}, rank=1)
+        scorer = _empty_scorer()
 
         # Should have bonus weights for streak, combo, achievements, etc.
         self.assertGreater(len(scorer.bonus_weights), 0)
@@ -937,9 +935,10 @@ class TestRegressionDetector(unittest.TestCase):
 class TestV3IntegrationWithRegression(unittest.TestCase):
     """Test v3.0 full integration including regression detection."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.history_data = [
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data shared by every test; the scorer never mutates it."""
+        cls.history_data = [
             {
                 "sessionId": "session1",
                 "project": "project_a",
@@ -948,22 +947,27 @@ class TestV3IntegrationWithRegression(unittest.TestCase):
             },
         ]
 
-        self.stats_data = {
-            "models": {
-                "claude-sonnet-4.5": {"inputTokens": 50000, "outputTokens": 30000}
+        # Read-only views: a test that mutates shared input fails loudly
+        cls.stats_data = MappingProxyType(
+            {
+                "models": MappingProxyType(
+                    {"claude-sonnet-4.5": {"inputTokens": 50000, "outputTokens": 30000}}
+                )
             }
-        }
+        )
 
-        self.user_profile_v3 = {
-            "version": "3.0",
-            "current_rank": "Captain",
-            "current_score": 600,
-            "total_sessions": 5,
-            "recent_session_scores": [600.0, 580.0, 560.0, 540.0],
-            "streak_info": {"current": {"length": 2}},
-            "seasonal_info": {},
-            "achievements": [],
-        }
+        cls.user_profile_v3 = MappingProxyType(
+            {
+                "version": "3.0",
+                "current_rank": "Captain",
+                "current_score": 600,
+                "total_sessions": 5,
+                "recent_session_scores": [600.0, 580.0, 560.0, 540.0],
+                "streak_info": {"current": {"length": 2}},
+                "seasonal_info": {},
+                "achievements": [],
+            }
+        )
 
     def test_regression_info_in_total_score(self):
         """Test regression analysis included in total_score output."""
@@ -1005,5 +1009,1034 @@ class TestV3IntegrationWithRegression(unittest.TestCase):
         )
 
 
+@functools.lru_cache(maxsize=None)
+def _breakdown(score, categories):
+    """Read-only breakdown with every category at score, built once per key."""
+    return MappingProxyType(
+        {c: MappingProxyType({"score": score}) for c in categories}
+    )
+
+
+class TestDeltaCalculator(unittest.TestCase):
+    """Test snapshot delta calculation."""
+
+    # Categories DeltaCalculator reports changes for
+    CATEGORIES = (
+        "token_efficiency",
+        "optimization_adoption",
+        "self_sufficiency",
+        "improvement_trend",
+        "best_practices",
+    )
+
+    # (current score, previous score, expected change, expected change_pct)
+    CATEGORY_CASES = (
+        (60, 50, 10, 20.0),
+        (40, 50, -10, -20.0),
+        (50, 50, 0, 0.0),
+        (30, 0, 30, 0),
+    )
+
+    def _snapshot(self, category_score, rank_name="Pilot"):
+        """Build a snapshot with every category at the same score."""
+        return {
+            "scores": {
+                "total_score": category_score * len(self.CATEGORIES),
+                "breakdown": _breakdown(category_score, self.CATEGORIES),
+            },
+            "rank": {"name": rank_name},
+        }
+
+    def test_category_changes(self):
+        """Test per-category change and percentage for each case."""
+        for current, previous, change, change_pct in self.CATEGORY_CASES:
+            with self.subTest(current=current, previous=previous):
+                delta = DeltaCalculator.calculate_delta(
+                    self._snapshot(current), self._snapshot(previous)
+                )
+
+                self.assertEqual(
+                    set(delta["category_changes"]), set(self.CATEGORIES)
+                )
+                for category_delta in delta["category_changes"].values():
+                    self.assertEqual(category_delta["change"], change)
+                    self.assertAlmostEqual(category_delta["change_pct"], change_pct)
+                self.assertEqual(
+                    delta["score_change"], change * len(self.CATEGORIES)
+                )
+                self.assertIsNone(delta["rank_change"])
+
+    def test_rank_change(self):
+        """Test promotions and demotions are flagged."""
+        # (previous rank, current rank, promoted)
+        for previous, current, promoted in (
+            ("Cadet", "Captain", True),
+            ("Navigator", "Pilot", True),
+            ("Pilot", "Navigator", False),
+            ("Commander", "Captain", False),
+            ("Cadet", "Unknown", False),
+        ):
+            with self.subTest(previous=previous, current=current):
+                delta = DeltaCalculator.calculate_delta(
+                    self._snapshot(50, current), self._snapshot(50, previous)
+                )
+                self.assertEqual(
+                    delta["rank_change"],
+                    {"from": previous, "to": current, "promoted": promoted},
+                )
+
+
+class TestInsightsEngine(unittest.TestCase):
+    """Test prescriptive insight generation."""
+
+    # Breakdown that trips every insight generator
+    BREAKDOWN = {
+        "waste_awareness": {
+            "days_active": 10,
+            "waste_patterns": {
+                "repeated_context": {
+                    "waste_tokens": 2000,
+                    "examples": [
+                        {"snippet": "project setup notes", "waste_tokens": 200}
+                    ],
+                },
+                "verbose_prompts": {
+                    "waste_tokens": 1500,
+                    "frequency": 3,
+                    "examples": [
+                        {
+                            "verbose": "Could you please edit the file for me",
+                            "actual_tokens": 80,
+                            "baseline_tokens": 20,
+                            "concise_version": "Edit file.py",
+                        }
+                    ],
+                },
+                "redundant_file_reads": {"waste_tokens": 900, "frequency": 4},
+                "prompt_bloat": {"waste_tokens": 700, "bloat_phrases": {"please": 5}},
+            },
+        },
+        "cache_effectiveness": {"cache_hit_rate": 10.0, "total_regular_input": 10000},
+        "token_efficiency": {
+            "tier": "poor",
+            "user_avg": 5000,
+            "baseline_avg": 2000,
+            "ratio": 2.5,
+        },
+    }
+
+    # Insight types in priority order; generator order breaks ties
+    EXPECTED_TYPES = [
+        "repeated_context",
+        "cache_drop",
+        "efficiency_pattern",
+        "verbose_prompts",
+        "prompt_bloat",
+        "redundant_reads",
+    ]
+
+    def _engine(self, breakdown=None):
+        """Engine over the shared breakdown unless one is given."""
+        from token_craft.insights_engine import InsightsEngine
+
+        if breakdown is None:
+            breakdown = self.BREAKDOWN
+        return InsightsEngine({"breakdown": breakdown}, [])
+
+    def test_insights_sorted_by_priority(self):
+        """Test every generator fires and results come out high to low."""
+        insights = self._engine().generate_insights()
+        self.assertEqual([i["type"] for i in insights], self.EXPECTED_TYPES)
+
+    def test_repeated_context_message(self):
+        """Test the example snippet and daily savings in the top insight."""
+        insight = self._engine().generate_insights()[0]
+        self.assertIn('"project setup notes"', insight["message"])
+        self.assertIn("Wasted 2,000 tokens", insight["message"])
+        self.assertEqual(insight["daily_savings"], 200)
+
+    def test_repeated_context_legacy_string_example(self):
+        """Test string examples from older breakdowns still yield a snippet."""
+        breakdown = {
+            "waste_awareness": {
+                "waste_patterns": {
+                    "repeated_context": {
+                        "waste_tokens": 2000,
+                        "examples": ['"project setup notes..." (200 tokens)'],
+                    }
+                }
+            }
+        }
+        insight = self._engine(breakdown).generate_insights()[0]
+        self.assertIn('"project setup notes"', insight["message"])
+
+    def test_waste_detector_structured_examples(self):
+        """Test repeated-context examples are emitted as snippet dicts."""
+        from token_craft.waste_detector import WasteDetector
+
+        shared = " ".join(f"word{i}" for i in range(40))
+        history = [
+            {"sessionId": "s1", "type": "say", "text": f"{shared} first"},
+            {"sessionId": "s1", "type": "say", "text": f"{shared} second"},
+        ]
+        result = WasteDetector(history).detect_repeated_context()
+
+        self.assertEqual(result["frequency"], 1)
+        (example,) = result["examples"]
+        self.assertEqual(set(example), {"snippet", "waste_tokens"})
+        self.assertIn(example["snippet"].split()[0], shared.split())
+        self.assertLessEqual(len(example["snippet"]), 60)
+        self.assertEqual(example["waste_tokens"], result["estimated_waste"])
+
+    def test_no_insights_without_breakdown_data(self):
+        """Test missing sections never produce insights, e.g. a 0% cache rate."""
+        for breakdown in ({}, {"token_efficiency": {"tier": "average"}}):
+            with self.subTest(breakdown=breakdown):
+                self.assertEqual(self._engine(breakdown).generate_insights(), [])
+
+    def test_insights_generated_once(self):
+        """Test repeat calls reuse the first result and return copies."""
+        engine = self._engine()
+        first = engine.generate_insights()
+        first.clear()
+
+        with mock.patch.object(engine, "_generate_cache_drop_insights") as gen:
+            second = engine.generate_insights()
+        gen.assert_not_called()
+        self.assertEqual([i["type"] for i in second], self.EXPECTED_TYPES)
+
+    def test_format_insights_section(self):
+        """Test the report section lists at most five insights."""
+        engine = self._engine()
+        section = engine.format_insights_section(engine.generate_insights())
+
+        self.assertTrue(section.startswith("⚠️  Optimization Opportunities:"))
+        self.assertIn("1. REPEATED CONTEXT (HIGH Priority)", section)
+        self.assertIn("5. PROMPT BLOAT (MEDIUM Priority)", section)
+        self.assertNotIn("REDUNDANT FILE READS", section)
+        self.assertEqual(engine.format_insights_section([]), "")
+
+
+class TestPricingCalculator(unittest.TestCase):
+    """Test cost calculations against the bundled pricing config."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the bundled pricing config once."""
+        cls.calc = PricingCalculator()
+
+    def test_calculate_cost(self):
+        """Test input/output pricing per million tokens."""
+        cost = self.calc.calculate_cost(4500, 10500, "claude-sonnet-4-5")
+
+        self.assertEqual(cost["total_cost"], 0.171)
+        self.assertEqual(cost["total_tokens"], 15000)
+        self.assertEqual(set(cost["breakdown"]), {"input", "output"})
+        self.assertAlmostEqual(cost["breakdown"]["output"]["cost"], 0.1575)
+
+    def test_calculate_cost_with_cache(self):
+        """Test cache writes replace input pricing and reads are added."""
+        cost = self.calc.calculate_cost(
+            4500, 10500, "claude-sonnet-4-5", use_cache=True, cache_read_tokens=5000
+        )
+
+        self.assertEqual(cost["total_cost"], 0.1759)
+        self.assertEqual(
+            set(cost["breakdown"]), {"cache_write", "cache_read", "output"}
+        )
+
+    def test_calculate_cost_errors(self):
+        """Test unknown models and unpriced models report errors."""
+        missing = self.calc.calculate_cost(1, 1, "no-such-model")
+        self.assertIn("not found", missing["error"])
+        self.assertEqual(missing["total_cost"], 0)
+
+        unpriced = self.calc.calculate_cost(1, 1, "claude-opus-4-6", "google_vertex")
+        self.assertIn("Pricing not available", unpriced["error"])
+        self.assertIn("note", unpriced)
+
+    def test_calculate_savings(self):
+        """Test savings between current and optimized token totals."""
+        savings = self.calc.calculate_savings(
+            1_200_000, 800_000, "claude-sonnet-4-5"
+        )
+
+        self.assertEqual(savings["current_cost"], 13.68)
+        self.assertEqual(savings["optimized_cost"], 9.12)
+        self.assertEqual(savings["savings"], 4.56)
+        self.assertEqual(savings["savings_percent"], 33.3)
+        self.assertEqual(savings["tokens_saved"], 400_000)
+
+    def test_compare_deployments(self):
+        """Test every deployment listing the model, priced or not."""
+        comparison = self.calc.compare_deployments(4500, 10500, "claude-opus-4-6")
+
+        self.assertEqual(comparison["direct_api"]["cost"], 0.855)
+        self.assertEqual(comparison["aws_bedrock"]["cost"], 1.71)
+        self.assertEqual(
+            comparison["google_vertex"],
+            {"name": "Google Vertex AI", "cost": 0, "available": False},
+        )
+
+
+# Temporary root shared by every TempDirTestCase in this module
+_TMP_ROOT = None
+
+
+def setUpModule():
+    """Create the module-wide temporary root."""
+    global _TMP_ROOT
+    _TMP_ROOT = tempfile.TemporaryDirectory(prefix="token-craft-")
+
+
+def tearDownModule():
+    """Remove the module-wide temporary root and everything under it."""
+    _TMP_ROOT.cleanup()
+
+
+@pytest.mark.slow
+class TempDirTestCase(unittest.TestCase):
+    """
+    Base class giving each test an empty directory in self.tmp_dir.
+
+    Marked slow; the mark is inherited by every subclass.
+
+    Each class gets a subdirectory of one module-wide temporary root,
+    which is removed once in tearDownModule rather than per test or class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create this class's directory under the module root."""
+        super().setUpClass()
+        cls._tmp_root_path = Path(_TMP_ROOT.name) / cls.__name__
+        cls._tmp_root_path.mkdir()
+
+    def setUp(self):
+        """Create this test's directory, named after the test method."""
+        self.tmp_dir = self._tmp_root_path / self._testMethodName
+        self.tmp_dir.mkdir()
+
+
+class TempHomeTestCase(TempDirTestCase):
+    """TempDirTestCase with Path.home() pointing at self.tmp_dir."""
+
+    def setUp(self):
+        """Patch the home directory for the duration of the test."""
+        super().setUp()
+        patcher = mock.patch.object(Path, "home", return_value=self.tmp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestUserProfileAchievements(TempDirTestCase):
+    """Test achievement ownership tracking on UserProfile."""
+
+    def test_add_and_has_achievement(self):
+        """Test added achievements are reported as owned, without duplicates."""
+        profile = UserProfile("user@example.com", self.tmp_dir)
+        self.assertFalse(profile.has_achievement("first_pilot"))
+
+        self.assertTrue(profile.add_achievement("first_pilot", "First Pilot", "d"))
+        self.assertFalse(profile.add_achievement("first_pilot", "First Pilot", "d"))
+
+        self.assertTrue(profile.has_achievement("first_pilot"))
+        self.assertEqual(profile.owned_ids(), {"first_pilot"})
+        self.assertEqual(len(profile.get_achievements()), 1)
+
+    def test_owned_ids_loaded_from_disk(self):
+        """Test achievements saved earlier are known after reloading."""
+        profile = UserProfile("user@example.com", self.tmp_dir)
+        profile.add_achievement("halfway_there", "Halfway There", "d")
+        profile.save()
+
+        reloaded = UserProfile("user@example.com", self.tmp_dir)
+        self.assertTrue(reloaded.has_achievement("halfway_there"))
+        self.assertFalse(reloaded.has_achievement("four_digits"))
+
+    def test_saved_email_skips_git_detection(self):
+        """Test an existing profile's email is reused without running git."""
+        UserProfile("user@example.com", self.tmp_dir).save()
+
+        with mock.patch.object(UserProfile, "_detect_user_email") as detect:
+            profile = UserProfile(profile_dir=self.tmp_dir)
+
+        detect.assert_not_called()
+        self.assertEqual(profile.user_email, "user@example.com")
+
+
+class TestHandlerAchievements(TempHomeTestCase):
+    """Test achievement awarding in the skill handler."""
+
+    PROMOTION = {"rank_change": {"from": "Cadet", "to": "Pilot", "promoted": True}}
+
+    def _handler(self, owned):
+        """Handler whose saved profile already owns the given achievements."""
+        import skill_handler
+
+        profile_dir = self.tmp_dir / ".claude" / "token-craft"
+        profile = UserProfile("user@example.com", profile_dir)
+        for achievement_id in owned:
+            profile.add_achievement(achievement_id, achievement_id, "d")
+        profile.save()
+
+        return skill_handler.TokenCraftHandler()
+
+    def test_veteran_only_checks_promotion(self):
+        """Test owning every fixed achievement skips the rules entirely."""
+        from token_craft.user_profile import ALL_ACHIEVEMENT_IDS
+
+        handler = self._handler(ALL_ACHIEVEMENT_IDS)
+        # Empty score data would fail any rule that were evaluated
+        handler._check_achievements({}, {"name": "Pilot"}, self.PROMOTION)
+
+        self.assertEqual(
+            handler.profile.owned_ids(), ALL_ACHIEVEMENT_IDS | {"promoted_to_pilot"}
+        )
+        self.assertEqual(
+            handler.profile.get_achievements()[-1]["title"], "Promoted to Pilot"
+        )
+
+    def test_owned_promotion_not_awarded_again(self):
+        """Test an already owned promotion achievement is not re-added."""
+        from token_craft.user_profile import ALL_ACHIEVEMENT_IDS
+
+        handler = self._handler(ALL_ACHIEVEMENT_IDS | {"promoted_to_pilot"})
+        before = handler.profile.get_achievements()
+        handler._check_achievements({}, {"name": "Pilot"}, self.PROMOTION)
+
+        self.assertEqual(handler.profile.get_achievements(), before)
+
+
+class TestSnapshotManager(TempDirTestCase):
+    """Test snapshot persistence."""
+
+    def setUp(self):
+        """Create a snapshot manager in a temporary directory."""
+        super().setUp()
+        self.manager = SnapshotManager(self.tmp_dir)
+
+    def test_create_and_read_snapshot(self):
+        """Test a written snapshot round-trips and leaves no temp file."""
+        score_data = {"total_score": 640.5, "breakdown": {"streaks": {3: 1.1}}}
+        rank_data = {"name": "Captain", "icon": "👨‍✈️"}
+
+        filename = self.manager.create_snapshot({"user": "u"}, score_data, rank_data)
+
+        snapshot = self.manager.get_latest_snapshot()
+        self.assertEqual(snapshot["scores"]["total_score"], 640.5)
+        self.assertEqual(snapshot["rank"], rank_data)
+        self.assertEqual(self.manager.list_snapshots(), [filename])
+        self.assertEqual(len(list(self.tmp_dir.iterdir())), 1)
+
+    def test_malformed_snapshots_normalized(self):
+        """Test loaded snapshots are dicts with dict sections, or None."""
+        snapshot_dir = self.tmp_dir
+        (snapshot_dir / "snapshot_1.json").write_text("[1, 2]", encoding="utf-8")
+        (snapshot_dir / "snapshot_2.json").write_text(
+            '{"profile": null, "scores": {"total_score": 5}}', encoding="utf-8"
+        )
+
+        self.assertIsNone(self.manager.get_snapshot("snapshot_1.json"))
+        snapshot = self.manager.get_snapshot("snapshot_2.json")
+        self.assertEqual(snapshot["profile"], {})
+        self.assertEqual(snapshot["rank"], {})
+        self.assertEqual(snapshot["scores"], {"total_score": 5})
+
+    def test_has_changed(self):
+        """Test change detection against the previous snapshot."""
+        previous = {"scores": {"total_score": 640.5}, "rank": {"name": "Captain"}}
+        rank = {"name": "Captain"}
+
+        self.assertTrue(SnapshotManager.has_changed(None, {"total_score": 1}, rank))
+        self.assertFalse(
+            SnapshotManager.has_changed(previous, {"total_score": 640.5}, rank)
+        )
+        self.assertTrue(
+            SnapshotManager.has_changed(previous, {"total_score": 650}, rank)
+        )
+
+
+class TestHistoryLoader(TempDirTestCase):
+    """Test history.jsonl / stats-cache.json loading."""
+
+    def setUp(self):
+        """Create a loader for a temporary Claude data directory."""
+        super().setUp()
+        self.claude_dir = self.tmp_dir
+        self.loader = HistoryLoader(self.claude_dir)
+
+    def test_missing_files_return_empty(self):
+        """Test missing files produce empty history and stats."""
+        history_data, stats_data = self.loader.load()
+        self.assertEqual(history_data, [])
+        self.assertEqual(stats_data, {})
+
+    def test_skips_blank_and_malformed_lines(self):
+        """Test blank, whitespace-only and invalid lines are skipped."""
+        lines = [
+            json.dumps({"sessionId": "s1", "message": "héllo"}),
+            "",
+            "   ",
+            "{not json",
+            "42",
+            json.dumps({"sessionId": "s2"}),
+        ]
+        # No trailing newline: the final line must still be parsed
+        self.loader.history_file.write_text("\r\n".join(lines), encoding="utf-8")
+
+        history_data = self.loader.load_history()
+        self.assertEqual([e["sessionId"] for e in history_data], ["s1", "s2"])
+        self.assertEqual(history_data[0]["message"], "héllo")
+
+    def test_lines_spanning_chunks(self):
+        """Test lines split across read blocks are reassembled."""
+        entries = [{"sessionId": f"s{i}", "message": "x" * 50} for i in range(50)]
+        self.loader.history_file.write_text(
+            "\n".join(json.dumps(e) for e in entries) + "\n", encoding="utf-8"
+        )
+        self.loader.CHUNK_SIZE = 64
+
+        self.assertEqual(self.loader.load_history(), entries)
+
+    def test_load_stats(self):
+        """Test stats-cache.json is parsed."""
+        stats = {"models": {"claude": {"inputTokens": 10, "outputTokens": 5}}}
+        self.loader.stats_file.write_text(json.dumps(stats), encoding="utf-8")
+        self.assertEqual(self.loader.load_stats(), stats)
+
+    def test_stdlib_batched_decode_matches_per_line(self):
+        """Test the stdlib single-array decode falls back on any bad line."""
+        good = [b'{"a": 1}', b'{"b": 2}']
+        mixed = [b'{"a": 1}', b"   ", b'{"b": 2', b'"c": 3}', b"[1, 2]"]
+
+        with mock.patch.object(history_loader, "HAS_ORJSON", False):
+            self.assertEqual(HistoryLoader._decode_lines(good), [{"a": 1}, {"b": 2}])
+            self.assertEqual(HistoryLoader._decode_lines(mixed), [{"a": 1}])
+
+    def test_cache_hit_skips_parse(self):
+        """Test an unchanged history file is served from the parse cache."""
+        self.loader.history_file.write_text('{"sessionId": "s1"}\n', encoding="utf-8")
+        self.assertEqual(len(self.loader.load_history()), 1)
+        self.assertTrue(self.loader.cache_file.exists())
+
+        self.loader._parse = None  # any parse attempt would now fail
+        self.assertEqual(self.loader.load_history(), [{"sessionId": "s1"}])
+
+    def test_appended_lines_parsed_incrementally(self):
+        """Test only appended lines are parsed, including a finished partial."""
+        history_file = self.loader.history_file
+        history_file.write_text(
+            '{"sessionId": "s1"}\n{"sessionId": "s2', encoding="utf-8"
+        )
+        self.assertEqual(self.loader.load_history(), [{"sessionId": "s1"}])
+
+        with open(history_file, "a", encoding="utf-8") as f:
+            f.write('"}\n{"sessionId": "s3"}\n')
+
+        ids = [e["sessionId"] for e in self.loader.load_history()]
+        self.assertEqual(ids, ["s1", "s2", "s3"])
+
+    def test_rewritten_file_fully_reparsed(self):
+        """Test a rewritten (non-append) history file invalidates the cache."""
+        history_file = self.loader.history_file
+        history_file.write_text('{"sessionId": "s1"}\n', encoding="utf-8")
+        self.loader.load_history()
+
+        history_file.write_text(
+            '{"sessionId": "a1"}\n{"sessionId": "a2"}\n', encoding="utf-8"
+        )
+        ids = [e["sessionId"] for e in self.loader.load_history()]
+        self.assertEqual(ids, ["a1", "a2"])
+
+
+class TestRecommendationTracker(TempHomeTestCase):
+    """Test recommendation lifecycle bookkeeping."""
+
+    def test_mark_implemented_updates_id_lists(self):
+        """Test pending/implemented IDs move correctly and persist as lists."""
+        tracker = RecommendationTracker()
+        for rec_id in ("r1", "r2", "r3"):
+            tracker.track_recommendation(rec_id, rec_id, "concise", {})
+
+        tracker.mark_implemented("r2", {"tokens_after": 0})
+        tracker.mark_implemented("r2", {"tokens_after": 0})
+
+        with open(tracker.recommendations_file, encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["pending"], ["r1", "r3"])
+        self.assertEqual(saved["implemented"], ["r2"])
+
+        reloaded = RecommendationTracker()
+        self.assertEqual(list(reloaded.recommendations["pending"]), ["r1", "r3"])
+        self.assertEqual(reloaded.get_recommendation_stats()["implemented"], 1)
+
+    def test_null_id_list_loads_as_empty(self):
+        """Test a null ID list in the saved file is treated as empty."""
+        tracker = RecommendationTracker()
+        tracker.track_recommendation("r1", "r1", "concise", {})
+        with open(tracker.recommendations_file, encoding="utf-8") as f:
+            saved = json.load(f)
+        saved["dismissed"] = None
+        with open(tracker.recommendations_file, "w", encoding="utf-8") as f:
+            json.dump(saved, f)
+
+        reloaded = RecommendationTracker()
+        self.assertEqual(list(reloaded.recommendations["dismissed"]), [])
+        self.assertEqual(list(reloaded.recommendations["pending"]), ["r1"])
+
+
+class TestPatternLibrary(TempHomeTestCase):
+    """Test pattern library discovery and trial bookkeeping."""
+
+    def _session(self, idx, tokens, text):
+        """Build a single-message session."""
+        return {
+            "sessionId": f"s{idx}",
+            "timestamp": idx,
+            "messages": [{"type": "say", "text": text, "tokens": tokens}],
+        }
+
+    def test_discovery_reused_for_unchanged_history(self):
+        """Test unchanged history is not rescanned, even after a reload."""
+        sessions = [self._session(i, 100, "fix it") for i in range(6)]
+        sessions += [self._session(i, 1000, "x" * 300) for i in range(6, 12)]
+
+        library = PatternLibrary()
+        with mock.patch.object(
+            library, "_save_patterns", wraps=library._save_patterns
+        ) as save:
+            candidates = library.discover_new_patterns(sessions)
+            self.assertEqual(len(candidates), 1)
+            self.assertEqual(library.discover_new_patterns(sessions), candidates)
+        # Saved once for the scan, not again for the repeat call
+        save.assert_called_once_with()
+
+        reloaded = PatternLibrary()
+        with mock.patch.object(reloaded, "_find_pattern_candidates") as scan:
+            self.assertEqual(reloaded.discover_new_patterns(sessions), candidates)
+            scan.assert_not_called()
+
+            scan.return_value = []
+            sessions.append(self._session(12, 100, "ok"))
+            self.assertEqual(reloaded.discover_new_patterns(sessions), [])
+            scan.assert_called_once_with(sessions)
+
+    def test_record_trial_updates_evidence(self):
+        """Test trial bookkeeping; trials are logged, not saved in full."""
+        library = PatternLibrary()
+        with mock.patch.object(library, "_save_patterns") as save:
+            for success in [True] * 8 + [False] * 2:
+                library.record_trial("pattern_defer_docs", success, 1000, 500, "s1")
+
+        save.assert_not_called()
+        self.assertEqual(len(library.trials_log_file.read_bytes().splitlines()), 10)
+
+        pattern = library._find_pattern("pattern_defer_docs")
+        evidence = pattern["evidence"]
+        self.assertEqual(evidence["trials"], 10)
+        self.assertAlmostEqual(evidence["success_rate"], 0.8)
+        self.assertEqual(evidence["avg_improvement"], 50.0)
+        self.assertEqual(evidence["confidence"], 0.90)
+        self.assertEqual(len(pattern["examples"]), 8)
+        self.assertEqual(pattern["status"], "validated")
+
+        # patterns.json still holds the seeded, trial-free evidence
+        saved = loads(library.patterns_file.read_bytes())
+        self.assertEqual(saved["patterns"][0]["evidence"]["trials"], 0)
+
+    def test_running_improvement_statistics(self):
+        """Test the running mean and stdev match a batch computation."""
+        library = PatternLibrary()
+        after_tokens = [900, 500, 750, 620, 400, 810]
+        with mock.patch.object(library, "_append_trial_event"):
+            for after in after_tokens:
+                library.record_trial("pattern_fast_mode", True, 1000, after, "s1")
+
+        improvements = [(1000 - after) / 10 for after in after_tokens]
+        evidence = library._find_pattern("pattern_fast_mode")["evidence"]
+        self.assertAlmostEqual(
+            evidence["avg_improvement"], statistics.mean(improvements)
+        )
+
+        result = library.validate_pattern("pattern_fast_mode")
+        self.assertEqual(result["avg_improvement"], 33.7)
+        self.assertEqual(
+            result["improvement_stdev"], round(statistics.stdev(improvements), 1)
+        )
+
+    def test_improvement_stdev_unknown_for_legacy_evidence(self):
+        """Test evidence saved without an M2 reports the stdev as unknown."""
+        library = PatternLibrary()
+        evidence = library._find_pattern("pattern_fast_mode")["evidence"]
+        evidence.update(
+            trials=4, success_count=4, success_rate=1.0, avg_improvement=30.0
+        )
+        with mock.patch.object(library, "_append_trial_event"):
+            library.record_trial("pattern_fast_mode", True, 1000, 500, "s1")
+
+        self.assertNotIn("improvement_m2", evidence)
+        self.assertEqual(evidence["avg_improvement"], 34.0)
+        result = library.validate_pattern("pattern_fast_mode")
+        self.assertIsNone(result["improvement_stdev"])
+
+    def test_pattern_report_counts_statuses(self):
+        """Test the report header counts patterns by status."""
+        library = PatternLibrary()
+        with mock.patch.object(library, "_append_trial_event"):
+            for _ in range(10):
+                library.record_trial("pattern_claude_md", True, 1000, 700, "s1")
+                library.record_trial("pattern_fast_mode", False, 1000, 1200, "s1")
+
+        report = library.generate_pattern_report()
+
+        self.assertIn("Total patterns: 4", report)
+        self.assertIn("  Validated: 1\n  Experimental: 2\n  Deprecated: 1", report)
+        self.assertIn("  CLAUDE.md Setup\n    Success rate: 100%", report)
+
+    def test_top_patterns(self):
+        """Test top patterns skip thin and deprecated ones, ties keep order."""
+        library = PatternLibrary()
+        trials = {
+            "pattern_defer_docs": [(True, 600)] * 3,
+            "pattern_claude_md": [(True, 600)] * 3,
+            "pattern_concise_prompts": [(True, 100)] * 2,
+            "pattern_fast_mode": [(False, 1200)] * 10,
+        }
+        with mock.patch.object(library, "_append_trial_event"):
+            for pattern_id, outcomes in trials.items():
+                for success, after in outcomes:
+                    library.record_trial(pattern_id, success, 1000, after, "s1")
+
+        top = [p["id"] for p in library.get_top_patterns()]
+        self.assertEqual(top, ["pattern_defer_docs", "pattern_claude_md"])
+        self.assertEqual(
+            [p["id"] for p in library.get_top_patterns(limit=1)], top[:1]
+        )
+
+    def test_save_fsync_is_opt_in(self):
+        """Test patterns.json is only fsynced when TOKEN_CRAFT_FSYNC=1."""
+        library = PatternLibrary()
+        for env, expected_calls in (({}, 0), ({"TOKEN_CRAFT_FSYNC": "1"}, 1)):
+            with self.subTest(env=env), mock.patch.dict(
+                "os.environ", env, clear=True
+            ), mock.patch("os.fsync") as fsync:
+                library._save_patterns()
+
+            self.assertEqual(fsync.call_count, expected_calls)
+            saved = loads(library.patterns_file.read_bytes())
+            self.assertEqual(saved, library.patterns)
+
+    def test_trial_log_replayed_on_load(self):
+        """Test logged trials survive a reload, which compacts the log."""
+        library = PatternLibrary()
+        for success in (True, True, False):
+            library.record_trial("pattern_claude_md", success, 1000, 600, "s1")
+        trial_log = library.trials_log_file.read_bytes()
+        expected = library._find_pattern("pattern_claude_md")
+
+        reloaded = PatternLibrary()
+        self.assertEqual(reloaded._find_pattern("pattern_claude_md"), expected)
+        self.assertFalse(reloaded.trials_log_file.exists())
+        saved = loads(reloaded.patterns_file.read_bytes())
+        self.assertEqual(saved["patterns"], reloaded.patterns["patterns"])
+
+        # A log left behind after compaction is not applied twice
+        reloaded.trials_log_file.write_bytes(trial_log + b"not json\n")
+        again = PatternLibrary()
+        self.assertEqual(again._find_pattern("pattern_claude_md"), expected)
+
+        # Seeding copied the module-level defaults rather than sharing them
+        from token_craft.pattern_library import DEFAULT_PATTERNS
+
+        self.assertTrue(all(p["evidence"]["trials"] == 0 for p in DEFAULT_PATTERNS))
+        self.assertTrue(all("created_at" not in p for p in DEFAULT_PATTERNS))
+
+
+class TestExperimentationFramework(TempHomeTestCase):
+    """Test experiment arm bookkeeping."""
+
+    def test_sessions_accumulate_per_arm(self):
+        """Test arm totals and averages in memory, with saving stubbed out."""
+        with mock.patch.object(ExperimentationFramework, "_save_experiments"):
+            framework = ExperimentationFramework()
+            exp_id = framework.create_experiment("Docs", "docs_first", "defer_docs")
+            for session_id, tag, tokens in (
+                ("s1", "docs_first", 3000),
+                ("s2", "defer_docs", 1000),
+                ("s3", "defer_docs", 2000),
+                ("s4", "unrelated", 9000),
+            ):
+                framework.add_session_to_experiment(exp_id, session_id, tag, tokens)
+
+        self.assertFalse(framework.experiments_file.exists())
+
+        control, treatment = framework._find_experiment(exp_id)["arms"]
+        self.assertEqual(control["sessions"], ["s1"])
+        self.assertEqual(control["avg_tokens_per_session"], 3000)
+        self.assertEqual(treatment["sessions"], ["s2", "s3"])
+        self.assertEqual(treatment["total_tokens"], 3000)
+        self.assertEqual(treatment["avg_tokens_per_session"], 1500)
+
+
+class TestPricingProfileUpdate(TempDirTestCase):
+    """Test saving the default deployment into the user profile."""
+
+    def test_update_user_deployment_keeps_other_fields(self):
+        """Test deployment settings are merged into an existing profile."""
+        profile_path = self.tmp_dir / "user_profile.json"
+        profile_path.write_bytes(dumps({"user_email": "user@example.com"}))
+
+        updated = PricingCalculator().update_user_deployment(
+            "aws_bedrock", "claude-haiku-4-5", profile_path
+        )
+
+        self.assertTrue(updated)
+        self.assertEqual(
+            loads(profile_path.read_bytes()),
+            {
+                "user_email": "user@example.com",
+                "deployment_method": "aws_bedrock",
+                "default_model": "claude-haiku-4-5",
+            },
+        )
+
+
+# Fields shared by every session-meta file written in TestSessionAnalyzer
+_SESSION_TEMPLATE = {
+    "project_path": "/home/user/projects/token-craft",
+    "assistant_message_count": 5,
+    "duration_minutes": 20,
+    "input_tokens": 1000,
+    "output_tokens": 5000,
+    "tool_errors": 0,
+}
+
+
+# 12,000 chars of CLAUDE.md, i.e. ~3000 tokens at 4 chars per token
+_CLAUDE_MD_PAYLOAD = b"x" * 12000
+
+
+# Reply times (seconds) for nudge detection: mostly rapid vs. normal pacing
+_FAST_RESPONSE_TIMES = (10.0, 15.0, 20.0, 12.0, 300.0, 8.0, 25.0, 400.0, 11.0, 9.0)
+_NORMAL_RESPONSE_TIMES = (200.0, 350.0, 180.0, 600.0, 240.0, 90.0, 300.0)
+
+
+@functools.lru_cache(maxsize=None)
+def _default_response_times(user_msgs):
+    """Steady one-minute reply times; a shared tuple, encoded as a JSON array."""
+    return (60.0,) * user_msgs
+
+
+class TestSessionAnalyzer(TempHomeTestCase):
+    """Test structural analysis of /insights session data."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Analyze one shared data set for the tests that only read results."""
+        super().setUpClass()
+        shared_home = cls._tmp_root_path / "shared"
+        claude_dir = shared_home / ".claude"
+        cls._write_session_files(
+            claude_dir / "usage-data" / "session-meta",
+            (
+                {"session_id": "s1", "user_msgs": 60},
+                {"session_id": "s2", "user_msgs": 30, "first_prompt": "Add settings"},
+                {"session_id": "s3", "first_prompt": "Refactor the pricing module"},
+            ),
+        )
+
+        with mock.patch.object(Path, "home", return_value=shared_home):
+            cls.shared_analyzer = SessionAnalyzer(claude_dir=claude_dir)
+            cls.shared_results = cls.shared_analyzer.analyze_all()
+
+    def setUp(self):
+        """
+        Set up the test's Claude directory paths.
+
+        usage-data directories are created by the write helpers, so tests
+        that write nothing cost no mkdir calls.
+        """
+        super().setUp()
+        self.claude_dir = self.tmp_dir / ".claude"
+        self.session_meta_dir = self.claude_dir / "usage-data" / "session-meta"
+        self.facets_dir = self.claude_dir / "usage-data" / "facets"
+
+    @staticmethod
+    def _session_data(
+        session_id,
+        user_msgs=5,
+        first_prompt="Fix the failing login test",
+        response_times=None,
+    ):
+        """Build session-meta data; unspecified fields come from the template."""
+        return {
+            **_SESSION_TEMPLATE,
+            "session_id": session_id,
+            "user_message_count": user_msgs,
+            "first_prompt": first_prompt,
+            "user_response_times": (
+                _default_response_times(user_msgs)
+                if response_times is None
+                else response_times
+            ),
+        }
+
+    @classmethod
+    def _write_session_files(cls, meta_dir, specs):
+        """Write one session-meta file per spec (a dict of _session_data args)."""
+        meta_dir.mkdir(parents=True, exist_ok=True)
+        for spec in specs:
+            data = cls._session_data(**spec)
+            (meta_dir / f"{data['session_id']}.json").write_bytes(dumps(data))
+
+    def _write_sessions(self, *specs):
+        """Write session-meta files for this test."""
+        self._write_session_files(self.session_meta_dir, specs)
+
+    def _write_facets(self, outcomes):
+        """Write a facets file per session from a {session_id: outcome} map."""
+        facets_dir = self.facets_dir
+        facets_dir.mkdir(parents=True, exist_ok=True)
+        for session_id, outcome in outcomes.items():
+            data = {
+                "session_id": session_id,
+                "outcome": outcome,
+                "underlying_goal": "Fix the failing login test",
+                "friction_detail": "Kept retrying the same fix",
+                "claude_helpfulness": "slightly_helpful",
+            }
+            (facets_dir / f"{session_id}.json").write_bytes(dumps(data))
+
+    def test_no_data(self):
+        """Test analysis reports unavailable without session-meta files."""
+        results = SessionAnalyzer(claude_dir=self.claude_dir).analyze_all()
+        self.assertFalse(results["available"])
+
+    def test_full_analysis(self):
+        """Test long sessions are flagged and summarized."""
+        results = self.shared_results
+
+        self.assertTrue(results["available"])
+        risks = results["session_risks"]
+        self.assertEqual(risks["total_sessions_analyzed"], 3)
+        self.assertEqual(
+            [(s["session_id"], s["risk"]) for s in risks["risky_sessions"]],
+            [("s1", "danger"), ("s2", "warning")],
+        )
+        categories = [i["category"] for i in results["summary"]["issues"]]
+        self.assertIn("Long Sessions", categories)
+
+    def test_format_report(self):
+        """Test the report section lists each issue and the length details."""
+        report = self.shared_analyzer.format_report_section(self.shared_results)
+
+        issues = self.shared_results["summary"]["issues"]
+        self.assertIn(f"Found {len(issues)} issue(s):", report)
+        for issue in issues:
+            self.assertIn(issue["category"], report)
+        self.assertIn("Session Length Risk:", report)
+        self.assertIn("[DANGER] token-craft: 60 user msgs", report)
+
+    def test_cross_session_repetition(self):
+        """Test the same first prompt across sessions is reported once."""
+        self._write_sessions(
+            {"session_id": "s1", "first_prompt": "Why does the build fail on CI?"},
+            {"session_id": "s2", "first_prompt": "why does the build  fail on CI?"},
+            {"session_id": "s3", "first_prompt": "Write release notes for v1.1"},
+        )
+
+        analyzer = SessionAnalyzer(claude_dir=self.claude_dir)
+        repetitions = analyzer.detect_cross_session_repetition()
+
+        self.assertEqual(len(repetitions["repeated_prompts"]), 1)
+        self.assertEqual(repetitions["repeated_prompts"][0]["count"], 2)
+        self.assertEqual(repetitions["total_repeated_sessions"], 1)
+
+    def test_failed_sessions(self):
+        """Test sessions whose goal was not achieved are costed."""
+        self._write_sessions(
+            {"session_id": "s1"},
+            {"session_id": "s2", "first_prompt": "Add a settings page"},
+        )
+        self._write_facets({"s1": "not_achieved", "s2": "fully_achieved"})
+        (self.facets_dir / "broken.json").write_bytes(b"{not json")
+
+        failed = SessionAnalyzer(claude_dir=self.claude_dir).analyze_failed_sessions()
+
+        self.assertEqual(failed["total_facets_analyzed"], 2)
+        self.assertEqual(failed["count"], 1)
+        self.assertEqual(failed["failed_sessions"][0]["session_id"], "s1")
+        self.assertEqual(failed["total_wasted_output_tokens"], 5000)
+
+    def test_claude_md_impact(self):
+        """Test CLAUDE.md size is costed per message and flagged when large."""
+        self.claude_dir.mkdir()
+        (self.claude_dir / "CLAUDE.md").write_bytes(_CLAUDE_MD_PAYLOAD)
+        (self.claude_dir / "stats-cache.json").write_bytes(
+            dumps({"totalMessages": 100})
+        )
+        analyzer = SessionAnalyzer(claude_dir=self.claude_dir)
+
+        impact = analyzer.calculate_claude_md_impact()
+        self.assertEqual(impact["tokens_per_message"], 3000)
+        self.assertEqual(impact["total_claude_md_tokens"], 300000)
+        self.assertEqual(impact["estimated_cache_read_cost"], 0.09)
+        self.assertFalse(impact["is_oversized"])
+
+        # A second CLAUDE.md in the home directory is loaded as well
+        (self.tmp_dir / "CLAUDE.md").write_bytes(_CLAUDE_MD_PAYLOAD)
+        impact = analyzer.calculate_claude_md_impact()
+        self.assertEqual(len(impact["files"]), 2)
+        self.assertEqual(impact["tokens_per_message"], 6000)
+        self.assertTrue(impact["is_oversized"])
+
+    def test_nudge_detection(self):
+        """Test rapid follow-ups are detected and normal pacing is not."""
+        self._write_sessions(
+            {
+                "session_id": "fast",
+                "user_msgs": len(_FAST_RESPONSE_TIMES),
+                "response_times": _FAST_RESPONSE_TIMES,
+            },
+            {
+                "session_id": "normal",
+                "user_msgs": len(_NORMAL_RESPONSE_TIMES),
+                "response_times": _NORMAL_RESPONSE_TIMES,
+            },
+        )
+
+        analyzer = SessionAnalyzer(claude_dir=self.claude_dir)
+        nudges = analyzer.detect_nudge_patterns()
+
+        self.assertEqual(nudges["count"], 1)
+        self.assertEqual(nudges["nudge_sessions"][0]["session_id"], "fast")
+        self.assertEqual(nudges["nudge_sessions"][0]["fast_responses"], 8)
+
+
+@pytest.mark.slow
+class TestPackageImports(unittest.TestCase):
+    """Test lazy loading of the token_craft package exports."""
+
+    def test_submodules_imported_on_first_access(self):
+        """Test importing one submodule does not import the others."""
+        code = (
+            "import sys, token_craft.rank_system\n"
+            "print('token_craft.report_generator' in sys.modules)\n"
+            "from token_craft import ReportGenerator\n"
+            "print(ReportGenerator.__module__)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(
+            result.stdout.split(), ["False", "token_craft.report_generator"]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
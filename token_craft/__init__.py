@@ -7,19 +7,60 @@ A gamified token optimization system inspired by retro computing constraints.
 __version__ = "1.1.0"
 __author__ = "Dmitriy Zhorov"
 
-from .scoring_engine import TokenCraftScorer
-from .rank_system import SpaceRankSystem
-from .user_profile import UserProfile
-from .snapshot_manager import SnapshotManager
-from .delta_calculator import DeltaCalculator
-from .report_generator import ReportGenerator
-from .progress_visualizer import ProgressVisualizer
-from .leaderboard_generator import LeaderboardGenerator
-from .hero_api_client import HeroAPIClient, MockHeroClient
-from .team_exporter import TeamExporter
-from .recommendation_engine import RecommendationEngine
-from .interactive_menu import InteractiveMenu
-from .pricing_calculator import PricingCalculator
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it. Submodules are imported on first
+# attribute access (PEP 562), so importing one module such as
+# token_craft.rank_system does not pull in the whole package.
+_LAZY_IMPORTS = {
+    "TokenCraftScorer": "scoring_engine",
+    "SpaceRankSystem": "rank_system",
+    "UserProfile": "user_profile",
+    "SnapshotManager": "snapshot_manager",
+    "DeltaCalculator": "delta_calculator",
+    "ReportGenerator": "report_generator",
+    "ProgressVisualizer": "progress_visualizer",
+    "LeaderboardGenerator": "leaderboard_generator",
+    "HeroAPIClient": "hero_api_client",
+    "MockHeroClient": "hero_api_client",
+    "TeamExporter": "team_exporter",
+    "RecommendationEngine": "recommendation_engine",
+    "InteractiveMenu": "interactive_menu",
+    "PricingCalculator": "pricing_calculator",
+}
+
+if TYPE_CHECKING:
+    from .scoring_engine import TokenCraftScorer
+    from .rank_system import SpaceRankSystem
+    from .user_profile import UserProfile
+    from .snapshot_manager import SnapshotManager
+    from .delta_calculator import DeltaCalculator
+    from .report_generator import ReportGenerator
+    from .progress_visualizer import ProgressVisualizer
+    from .leaderboard_generator import LeaderboardGenerator
+    from .hero_api_client import HeroAPIClient, MockHeroClient
+    from .team_exporter import TeamExporter
+    from .recommendation_engine import RecommendationEngine
+    from .interactive_menu import InteractiveMenu
+    from .pricing_calculator import PricingCalculator
+
+
+def __getattr__(name):
+    """Import a public class from its submodule on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include lazily imported names in dir(token_craft)."""
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "TokenCraftScorer",
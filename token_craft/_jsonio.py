@@ -0,0 +1,44 @@
+"""
+JSON I/O helpers
+
+Uses orjson when installed and falls back to the standard library.
+Both paths work on bytes, so callers open files in binary mode.
+"""
+
+import json
+from typing import Any, Union
+
+# Optional import - ~5x faster JSON parsing and serialization when available
+try:
+    import orjson  # type: ignore[import]
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """
+    Encode obj as UTF-8 JSON bytes.
+
+    Args:
+        obj: Value to encode
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        Encoded JSON
+    """
+    if HAS_ORJSON:
+        # Non-string keys are stringified, matching the stdlib behaviour
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
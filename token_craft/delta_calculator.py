@@ -6,6 +6,11 @@ Calculates and formats changes between snapshots.
 
 from typing import Dict, Optional
 
+from .rank_system import SpaceRankSystem
+
+# Rank name -> position in the v3 rank ladder, lowest first
+RANK_ORDER = {rank["name"]: i for i, rank in enumerate(SpaceRankSystem.RANKS)}
+
 
 class DeltaCalculator:
     """Calculate deltas between snapshots."""
@@ -104,17 +109,11 @@ class DeltaCalculator:
     @staticmethod
     def _is_promotion(from_rank: str, to_rank: str) -> bool:
         """Check if rank change is a promotion."""
-        rank_order = [
-            "Cadet", "Pilot", "Navigator", "Commander",
-            "Captain", "Admiral", "Galactic Legend"
-        ]
-
-        try:
-            from_index = rank_order.index(from_rank)
-            to_index = rank_order.index(to_rank)
-            return to_index > from_index
-        except ValueError:
+        from_index = RANK_ORDER.get(from_rank)
+        to_index = RANK_ORDER.get(to_rank)
+        if from_index is None or to_index is None:
             return False
+        return to_index > from_index
 
     @staticmethod
     def format_delta(delta: Dict) -> str:
@@ -4,12 +4,13 @@ Experimentation Framework
 Enable A/B testing by auto-detecting approaches and comparing outcomes.
 """
 
-import json
 import statistics
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from ._jsonio import dumps, loads
+
 
 class ExperimentationFramework:
     """A/B testing framework for optimization approaches."""
@@ -29,8 +30,8 @@ class ExperimentationFramework:
         """Load experiments from file."""
         if self.experiments_file.exists():
             try:
-                with open(self.experiments_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.experiments_file, 'rb') as f:
+                    return loads(f.read())
             except:
                 pass
 
@@ -41,8 +42,8 @@ class ExperimentationFramework:
 
     def _save_experiments(self):
         """Save experiments to file."""
-        with open(self.experiments_file, 'w', encoding='utf-8') as f:
-            json.dump(self.experiments, f, indent=2)
+        with open(self.experiments_file, 'wb') as f:
+            f.write(dumps(self.experiments, indent=True))
 
     def auto_detect_approach(self, session: Dict) -> List[str]:
         """
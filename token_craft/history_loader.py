@@ -0,0 +1,267 @@
+"""
+History Loader
+
+Reads Claude Code's history.jsonl and stats-cache.json from disk.
+Parsed history is cached and only newly appended lines are re-parsed.
+"""
+
+import json
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from ._jsonio import HAS_ORJSON, loads as _loads
+
+
+class HistoryLoader:
+    """Load history and stats data for analysis."""
+
+    # Read size for scanning history.jsonl
+    CHUNK_SIZE = 64 * 1024
+
+    # Bytes before the cached offset used to detect a rewritten history file
+    TAIL_CHECK_SIZE = 64
+
+    CACHE_VERSION = 1
+
+    def __init__(
+        self, claude_dir: Optional[Path] = None, cache_file: Optional[Path] = None
+    ):
+        """
+        Initialize history loader.
+
+        Args:
+            claude_dir: Custom Claude data directory (optional)
+            cache_file: Custom parse cache location (optional)
+        """
+        if claude_dir:
+            self.claude_dir = Path(claude_dir)
+        else:
+            self.claude_dir = Path.home() / ".claude"
+
+        self.history_file = self.claude_dir / "history.jsonl"
+        self.stats_file = self.claude_dir / "stats-cache.json"
+
+        if cache_file:
+            self.cache_file = Path(cache_file)
+        else:
+            self.cache_file = self.claude_dir / "token-craft" / "history_cache.pkl"
+
+    def load(self) -> Tuple[List[Dict], Dict]:
+        """
+        Load history and stats data.
+
+        The two files are independent, so they are read concurrently and
+        the small stats read hides behind the history parse.
+
+        Returns:
+            Tuple of (history_data, stats_data)
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            history_future = executor.submit(self.load_history)
+            stats_future = executor.submit(self.load_stats)
+            return history_future.result(), stats_future.result()
+
+    def load_history(self) -> List[Dict]:
+        """
+        Parse history.jsonl, skipping blank and malformed lines.
+
+        Unchanged files are served from the parse cache; files that only
+        grew since the last run have just the appended bytes parsed.
+
+        Returns:
+            List of history entries
+        """
+        if not self.history_file.exists():
+            return []
+
+        try:
+            st = self.history_file.stat()
+            cache = self._read_cache()
+            if cache and (cache["mtime_ns"], cache["size"]) == (
+                st.st_mtime_ns,
+                st.st_size,
+            ):
+                return cache["records"] + cache["partial"]
+
+            with open(self.history_file, "rb") as f:
+                records: List[Dict] = []
+                offset = 0
+                if cache and self._is_append_of(f, cache, st.st_size):
+                    records = cache["records"]
+                    offset = cache["offset"]
+
+                self._advise_sequential(f, offset)
+                f.seek(offset)
+                new_records, partial, consumed = self._parse(f)
+                records.extend(new_records)
+                offset += consumed
+
+                f.seek(max(offset - self.TAIL_CHECK_SIZE, 0))
+                tail = f.read(min(offset, self.TAIL_CHECK_SIZE))
+
+            self._write_cache(
+                {
+                    "version": self.CACHE_VERSION,
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "offset": offset,
+                    "tail": tail,
+                    "records": records,
+                    "partial": partial,
+                }
+            )
+            return records + partial
+        except Exception as e:
+            print(f"Warning: Could not load history.jsonl: {e}")
+            return []
+
+    def load_stats(self) -> Dict:
+        """
+        Parse stats-cache.json.
+
+        Returns:
+            Stats dict (empty if missing or unreadable)
+        """
+        stats_data = {}
+        if self.stats_file.exists():
+            try:
+                with open(self.stats_file, "rb") as f:
+                    stats_data = _loads(f.read())
+            except Exception as e:
+                print(f"Warning: Could not load stats-cache.json: {e}")
+
+        return stats_data
+
+    def _parse(self, f: BinaryIO) -> Tuple[List[Dict], List[Dict], int]:
+        """
+        Parse JSONL from the current file position to EOF.
+
+        Returns:
+            Tuple of (records from complete lines, record from a trailing
+            unterminated line if any, bytes consumed up to the last newline)
+        """
+        lines: List[bytes] = []
+        partial: List[Dict] = []
+        start = f.tell()
+        pending_len = 0
+
+        for line, complete in self._iter_lines(f):
+            if complete:
+                lines.append(line)
+                continue
+
+            # May still be mid-write; re-read it next time
+            pending_len = len(line)
+            partial = self._decode_lines([line])
+
+        return self._decode_lines(lines), partial, f.tell() - start - pending_len
+
+    @staticmethod
+    def _decode_lines(lines: List[bytes]) -> List[Dict]:
+        """Decode JSONL lines, dropping blank, malformed or non-object ones."""
+        if not HAS_ORJSON and len(lines) > 1:
+            # stdlib json pays per-call overhead, so parse all lines as one
+            # array; any bad line makes this fail and we go line by line
+            try:
+                records = json.loads(b"[" + b",".join(lines) + b"]")
+            except ValueError:
+                records = None
+            if (
+                records is not None
+                and len(records) == len(lines)
+                and all(isinstance(r, dict) for r in records)
+            ):
+                return records
+
+        records = []
+        for line in lines:
+            # Entries are JSON objects; rejecting other lines up front avoids
+            # raising and discarding a decode error for blank or junk lines
+            if line.lstrip()[:1] != b"{":
+                continue
+            try:
+                records.append(_loads(line))
+            except ValueError:
+                # Covers JSONDecodeError and undecodable bytes
+                continue
+        return records
+
+    @staticmethod
+    def _advise_sequential(f: BinaryIO, offset: int) -> None:
+        """Hint the kernel to read ahead from offset to EOF (POSIX only)."""
+        if not hasattr(os, "posix_fadvise"):
+            return
+
+        try:
+            fd = f.fileno()
+            os.posix_fadvise(fd, offset, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, offset, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+
+    def _is_append_of(self, f: BinaryIO, cache: Dict, size: int) -> bool:
+        """Check whether the file still starts with the cached content."""
+        offset = cache["offset"]
+        if size < offset:
+            return False
+
+        tail = cache["tail"]
+        f.seek(offset - len(tail))
+        return f.read(len(tail)) == tail
+
+    def _read_cache(self) -> Optional[Dict]:
+        """Load the parse cache, ignoring missing or stale caches."""
+        if not self.cache_file.exists():
+            return None
+
+        try:
+            with open(self.cache_file, "rb") as f:
+                cache = pickle.load(f)
+        except Exception:
+            return None
+
+        if not isinstance(cache, dict) or cache.get("version") != self.CACHE_VERSION:
+            return None
+        return cache
+
+    def _write_cache(self, cache: Dict) -> None:
+        """Persist the parse cache; failures only cost a re-parse next run."""
+        tmp_path = self.cache_file.with_suffix(".tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            pass
+
+    @classmethod
+    def _iter_lines(cls, f: BinaryIO) -> Iterator[Tuple[bytes, bool]]:
+        """
+        Yield (line, newline_terminated) pairs for non-empty lines.
+
+        Scans fixed-size blocks for newlines instead of using readline(),
+        carrying any partial trailing line over into the next block.
+        """
+        pending = b""
+        while True:
+            block = f.read(cls.CHUNK_SIZE)
+            if not block:
+                break
+
+            buf = pending + block if pending else block
+            start = 0
+            while True:
+                idx = buf.find(b"\n", start)
+                if idx < 0:
+                    break
+                if idx > start:
+                    yield buf[start:idx], True
+                start = idx + 1
+            pending = buf[start:]
+
+        if pending:
+            yield pending, False
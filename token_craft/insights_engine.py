@@ -4,9 +4,17 @@ Prescriptive Insights Engine
 Generates specific, actionable, measurable insights instead of generic advice.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
+# Gates checked on every insight run, kept as plain names rather than
+# nested INSIGHT_TRIGGERS lookups
+REPEATED_CONTEXT_MIN_WASTE = 1000  # tokens wasted
+VERBOSE_PROMPTS_MIN_WASTE = 1000  # tokens wasted
+PROMPT_BLOAT_MIN_WASTE = 500  # tokens wasted
+REDUNDANT_READS_MIN_COUNT = 3  # same file read count
+LOW_CACHE_HIT_RATE = 30  # percent
+
 
 class InsightsEngine:
     """Generate prescriptive insights from waste and usage data."""
@@ -14,7 +22,7 @@ class InsightsEngine:
     # Threshold triggers for insights
     INSIGHT_TRIGGERS = {
         'repeated_context': {
-            'threshold': 1000,  # tokens wasted
+            'threshold': REPEATED_CONTEXT_MIN_WASTE,
             'frequency': 'daily',
             'priority': 'high'
         },
@@ -29,12 +37,12 @@ class InsightsEngine:
             'priority': 'high'
         },
         'redundant_reads': {
-            'threshold': 3,  # same file read count
+            'threshold': REDUNDANT_READS_MIN_COUNT,
             'frequency': 'daily',
             'priority': 'low'
         },
         'prompt_bloat': {
-            'threshold': 500,  # tokens wasted
+            'threshold': PROMPT_BLOAT_MIN_WASTE,
             'frequency': 'weekly',
             'priority': 'medium'
         }
@@ -52,56 +60,95 @@ class InsightsEngine:
         self.history_data = history_data
         self.breakdown = score_data.get("breakdown", {})
 
+        # Inputs are fixed for the engine's lifetime, so insights are
+        # generated once and reused by every report section that asks
+        self._insights: Optional[List[Dict]] = None
+
     def generate_insights(self) -> List[Dict]:
         """
         Generate all prescriptive insights.
 
+        Computed on the first call; later calls return a copy of the
+        cached list.
+
         Returns:
             List of insights sorted by priority
         """
-        insights = []
+        if self._insights is None:
+            self._insights = self._build_insights()
+        return list(self._insights)
 
-        # Generate insights from each data source
-        insights.extend(self._generate_repeated_context_insights())
-        insights.extend(self._generate_verbose_prompt_insights())
-        insights.extend(self._generate_cache_drop_insights())
-        insights.extend(self._generate_redundant_read_insights())
-        insights.extend(self._generate_prompt_bloat_insights())
-        insights.extend(self._generate_efficiency_pattern_insights())
+    def _build_insights(self) -> List[Dict]:
+        """Run every insight generator, highest priority first."""
+        # Read each breakdown section once and hand generators their part
+        waste_data = self.breakdown.get("waste_awareness", {})
+        cache_data = self.breakdown.get("cache_effectiveness", {})
+        token_efficiency = self.breakdown.get("token_efficiency", {})
 
-        # Sort by priority
-        priority_order = {'high': 0, 'medium': 1, 'low': 2}
-        insights.sort(key=lambda i: priority_order.get(i['priority'], 3))
+        # New users have none of these sections yet; nothing can fire
+        if not (waste_data or cache_data or token_efficiency):
+            return []
+
+        insights = []
+        patterns = waste_data.get("waste_patterns", {})
+
+        # Each generator emits a fixed priority, so calling them grouped by
+        # priority yields the sorted order without sorting
+
+        # High priority
+        insights.extend(self._generate_repeated_context_insights(
+            patterns.get("repeated_context", {}),
+            waste_data.get("days_active", 30)
+        ))
+        insights.extend(self._generate_cache_drop_insights(cache_data))
+        insights.extend(self._generate_efficiency_pattern_insights(token_efficiency))
+
+        # Medium priority
+        insights.extend(self._generate_verbose_prompt_insights(
+            patterns.get("verbose_prompts", {})
+        ))
+        insights.extend(self._generate_prompt_bloat_insights(
+            patterns.get("prompt_bloat", {})
+        ))
+
+        # Low priority
+        insights.extend(self._generate_redundant_read_insights(
+            patterns.get("redundant_file_reads", {})
+        ))
 
         return insights
 
-    def _generate_repeated_context_insights(self) -> List[Dict]:
-        """Generate insights about repeated context waste."""
-        insights = []
+    def _generate_repeated_context_insights(
+        self, repeated_context: Dict, days_active: int
+    ) -> List[Dict]:
+        """
+        Generate insights about repeated context waste.
 
-        waste_data = self.breakdown.get("waste_awareness", {})
-        patterns = waste_data.get("waste_patterns", {})
-        repeated_context = patterns.get("repeated_context", {})
+        Args:
+            repeated_context: "repeated_context" waste pattern
+            days_active: Days covered by the waste data
+        """
+        insights = []
 
         waste_tokens = repeated_context.get("waste_tokens", 0)
         examples = repeated_context.get("examples", [])
 
         # Check threshold
-        if waste_tokens < self.INSIGHT_TRIGGERS['repeated_context']['threshold']:
+        if waste_tokens < REPEATED_CONTEXT_MIN_WASTE:
             return insights
 
         # Calculate daily savings potential
-        days_active = waste_data.get("days_active", 30)
         daily_waste = waste_tokens / days_active if days_active > 0 else 0
 
-        # Extract example snippet
+        # WasteDetector emits {'snippet': str, 'waste_tokens': int} examples
         example_snippet = "project context"
-        if examples and len(examples) > 0:
-            example_text = examples[0]
-            if isinstance(example_text, str):
-                # Extract text from format like '"context snippet..." (200 tokens)'
-                if '"' in example_text:
-                    example_snippet = example_text.split('"')[1].split('...')[0]
+        if examples:
+            example = examples[0]
+            if isinstance(example, dict):
+                example_snippet = example.get('snippet', example_snippet)
+            elif isinstance(example, str) and '"' in example:
+                # Older breakdowns: '"context snippet..." (200 tokens)'
+                example_snippet = example.split('"')[1].split('...')[0]
 
         insight = {
             'type': 'repeated_context',
@@ -121,19 +168,15 @@ class InsightsEngine:
         insights.append(insight)
         return insights
 
-    def _generate_verbose_prompt_insights(self) -> List[Dict]:
-        """Generate insights about verbose prompts."""
+    def _generate_verbose_prompt_insights(self, verbose_prompts: Dict) -> List[Dict]:
+        """Generate insights about verbose prompts from their waste pattern."""
         insights = []
 
-        waste_data = self.breakdown.get("waste_awareness", {})
-        patterns = waste_data.get("waste_patterns", {})
-        verbose_prompts = patterns.get("verbose_prompts", {})
-
         waste_tokens = verbose_prompts.get("waste_tokens", 0)
         examples = verbose_prompts.get("examples", [])
 
         # Check threshold
-        if waste_tokens < 1000:  # Minimum threshold
+        if waste_tokens < VERBOSE_PROMPTS_MIN_WASTE:
             return insights
 
         # Calculate average waste per prompt
@@ -173,15 +216,18 @@ class InsightsEngine:
         insights.append(insight)
         return insights
 
-    def _generate_cache_drop_insights(self) -> List[Dict]:
-        """Generate insights about cache effectiveness drops."""
+    def _generate_cache_drop_insights(self, cache_data: Dict) -> List[Dict]:
+        """Generate insights about cache effectiveness drops from cache data."""
         insights = []
 
-        cache_data = self.breakdown.get("cache_effectiveness", {})
+        # Without cache data a 0% hit rate would be reported as a drop
+        if not cache_data:
+            return insights
+
         cache_hit_rate = cache_data.get("cache_hit_rate", 0)
 
         # Detect drops (would need historical data - for now, flag low rates)
-        if cache_hit_rate < 30:
+        if cache_hit_rate < LOW_CACHE_HIT_RATE:
             # Low cache usage
             total_regular_input = cache_data.get("total_regular_input", 0)
             potential_savings = int(total_regular_input * 0.6 * 0.9)  # 60% could be cached, 90% savings
@@ -206,19 +252,15 @@ class InsightsEngine:
 
         return insights
 
-    def _generate_redundant_read_insights(self) -> List[Dict]:
-        """Generate insights about redundant file reads."""
+    def _generate_redundant_read_insights(self, redundant_reads: Dict) -> List[Dict]:
+        """Generate insights about redundant file reads from their waste pattern."""
         insights = []
 
-        waste_data = self.breakdown.get("waste_awareness", {})
-        patterns = waste_data.get("waste_patterns", {})
-        redundant_reads = patterns.get("redundant_file_reads", {})
-
         waste_tokens = redundant_reads.get("waste_tokens", 0)
         total_redundant = redundant_reads.get("frequency", 0)
 
         # Check threshold
-        if total_redundant < 3:
+        if total_redundant < REDUNDANT_READS_MIN_COUNT:
             return insights
 
         insight = {
@@ -239,19 +281,15 @@ class InsightsEngine:
         insights.append(insight)
         return insights
 
-    def _generate_prompt_bloat_insights(self) -> List[Dict]:
-        """Generate insights about prompt bloat."""
+    def _generate_prompt_bloat_insights(self, prompt_bloat: Dict) -> List[Dict]:
+        """Generate insights about prompt bloat from its waste pattern."""
         insights = []
 
-        waste_data = self.breakdown.get("waste_awareness", {})
-        patterns = waste_data.get("waste_patterns", {})
-        prompt_bloat = patterns.get("prompt_bloat", {})
-
         waste_tokens = prompt_bloat.get("waste_tokens", 0)
         bloat_phrases = prompt_bloat.get("bloat_phrases", {})
 
         # Check threshold
-        if waste_tokens < self.INSIGHT_TRIGGERS['prompt_bloat']['threshold']:
+        if waste_tokens < PROMPT_BLOAT_MIN_WASTE:
             return insights
 
         # Get most common bloat phrase
@@ -278,11 +316,10 @@ class InsightsEngine:
         insights.append(insight)
         return insights
 
-    def _generate_efficiency_pattern_insights(self) -> List[Dict]:
-        """Generate insights about efficiency patterns."""
+    def _generate_efficiency_pattern_insights(self, token_efficiency: Dict) -> List[Dict]:
+        """Generate insights about efficiency patterns from token efficiency data."""
         insights = []
 
-        token_efficiency = self.breakdown.get("token_efficiency", {})
         tier = token_efficiency.get("tier", "average")
         user_avg = token_efficiency.get("user_avg", 0)
         baseline_avg = token_efficiency.get("baseline_avg", 0)
@@ -325,18 +362,19 @@ class InsightsEngine:
         if not insights:
             return ""
 
-        lines = []
-        lines.append("⚠️  Optimization Opportunities:")
-        lines.append("=" * 70)
-        lines.append("")
-
-        for i, insight in enumerate(insights[:5], 1):  # Show top 5
-            priority_label = f"({insight['priority'].upper()} Priority)"
-            lines.append(f"{i}. {insight['title']} {priority_label}")
-            lines.append(f"   {insight['message']}")
-            lines.append(f"   Fix: {insight['action']}")
-            lines.append(f"   Savings: ~{insight.get('daily_savings', 0):,.0f} tokens/day")
-            lines.append(f"   Time: {insight.get('implementation_time', 'Unknown')}")
-            lines.append("")
-
-        return "\n".join(lines)
+        header = "⚠️  Optimization Opportunities:\n" + "=" * 70 + "\n\n"
+        return header + "\n".join(
+            self._format_insight(i, insight)
+            for i, insight in enumerate(insights[:5], 1)  # Show top 5
+        )
+
+    @staticmethod
+    def _format_insight(number: int, insight: Dict) -> str:
+        """Format one numbered insight as a newline-terminated block."""
+        return (
+            f"{number}. {insight['title']} ({insight['priority'].upper()} Priority)\n"
+            f"   {insight['message']}\n"
+            f"   Fix: {insight['action']}\n"
+            f"   Savings: ~{insight.get('daily_savings', 0):,.0f} tokens/day\n"
+            f"   Time: {insight.get('implementation_time', 'Unknown')}\n"
+        )
@@ -4,12 +4,135 @@ Pattern Library
 Build evidence-based library of optimization patterns with success tracking.
 """
 
-import json
-import statistics
+import copy
+import heapq
+import math
+import os
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from ._jsonio import dumps, loads
+
+
+# Known optimization patterns a new library is seeded with; each gets a
+# created_at when seeded
+DEFAULT_PATTERNS = (
+    {
+        "id": "pattern_defer_docs",
+        "name": "Defer Documentation",
+        "category": "workflow",
+        "description": "Delay all documentation until code is ready to push",
+        "evidence": {
+            "trials": 0,
+            "success_count": 0,
+            "failure_count": 0,
+            "success_rate": 0.0,
+            "avg_improvement": 0.0,
+            "confidence": 0.0
+        },
+        "examples": [],
+        "implementation_guide": {
+            "setup_steps": [
+                "Add 'Defer documentation until ready to push' to CLAUDE.md",
+                "Use phrases like 'skip docs for now' in prompts"
+            ],
+            "validation_criteria": "No doc-related tokens in first 80% of sessions",
+            "expected_roi": "25-35% token savings"
+        },
+        "retirement_criteria": {
+            "min_trials": 10,
+            "min_success_rate": 0.70
+        },
+        "status": "experimental"
+    },
+    {
+        "id": "pattern_claude_md",
+        "name": "CLAUDE.md Setup",
+        "category": "configuration",
+        "description": "Create CLAUDE.md files in projects with context and preferences",
+        "evidence": {
+            "trials": 0,
+            "success_count": 0,
+            "failure_count": 0,
+            "success_rate": 0.0,
+            "avg_improvement": 0.0,
+            "confidence": 0.0
+        },
+        "examples": [],
+        "implementation_guide": {
+            "setup_steps": [
+                "Create CLAUDE.md in project root",
+                "Add project overview, tech stack, coding preferences"
+            ],
+            "validation_criteria": "CLAUDE.md exists and is >500 bytes",
+            "expected_roi": "1500-2500 tokens saved per session"
+        },
+        "retirement_criteria": {
+            "min_trials": 10,
+            "min_success_rate": 0.70
+        },
+        "status": "experimental"
+    },
+    {
+        "id": "pattern_concise_prompts",
+        "name": "Concise Prompts",
+        "category": "communication",
+        "description": "Use short, direct prompts without pleasantries",
+        "evidence": {
+            "trials": 0,
+            "success_count": 0,
+            "failure_count": 0,
+            "success_rate": 0.0,
+            "avg_improvement": 0.0,
+            "confidence": 0.0
+        },
+        "examples": [],
+        "implementation_guide": {
+            "setup_steps": [
+                "Remove 'please', 'could you', 'thank you' from prompts",
+                "Be direct: 'Edit file.py' vs 'Could you please edit file.py'"
+            ],
+            "validation_criteria": "Avg message length <150 chars",
+            "expected_roi": "10-20% token savings on inputs"
+        },
+        "retirement_criteria": {
+            "min_trials": 10,
+            "min_success_rate": 0.70
+        },
+        "status": "experimental"
+    },
+    {
+        "id": "pattern_fast_mode",
+        "name": "Fast Mode Usage",
+        "category": "efficiency",
+        "description": "Use /fast mode for simple, straightforward tasks",
+        "evidence": {
+            "trials": 0,
+            "success_count": 0,
+            "failure_count": 0,
+            "success_rate": 0.0,
+            "avg_improvement": 0.0,
+            "confidence": 0.0
+        },
+        "examples": [],
+        "implementation_guide": {
+            "setup_steps": [
+                "Type /fast before simple tasks",
+                "Use for file edits, simple debugging, quick queries"
+            ],
+            "validation_criteria": "Sessions with /fast have lower token usage",
+            "expected_roi": "Faster responses, potentially lower tokens"
+        },
+        "retirement_criteria": {
+            "min_trials": 10,
+            "min_success_rate": 0.70
+        },
+        "status": "experimental"
+    }
+)
+
 
 class PatternLibrary:
     """Evidence-based pattern collection with validation."""
@@ -18,6 +141,8 @@ class PatternLibrary:
         """Initialize pattern library."""
         self.token_craft_dir = Path.home() / ".claude" / "token-craft"
         self.patterns_file = self.token_craft_dir / "patterns.json"
+        # Trials recorded since patterns.json was last written, one per line
+        self.trials_log_file = self.token_craft_dir / "patterns.log"
 
         # Ensure directory exists
         self.token_craft_dir.mkdir(parents=True, exist_ok=True)
@@ -25,16 +150,24 @@ class PatternLibrary:
         # Load existing patterns
         self.patterns = self._load_patterns()
 
+        # Read logged trials first; seeding saves, which clears the log
+        trial_log = self._read_trial_log()
+
         # Seed with known patterns if empty
         if not self.patterns["patterns"]:
             self._seed_default_patterns()
 
+        self._index_patterns()
+
+        if trial_log:
+            self._replay_trials(trial_log)
+
     def _load_patterns(self) -> Dict:
         """Load patterns from file."""
         if self.patterns_file.exists():
             try:
-                with open(self.patterns_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.patterns_file, 'rb') as f:
+                    return loads(f.read())
             except:
                 pass
 
@@ -45,140 +178,61 @@ class PatternLibrary:
         }
 
     def _save_patterns(self):
-        """Save patterns to file."""
-        with open(self.patterns_file, 'w', encoding='utf-8') as f:
-            json.dump(self.patterns, f, indent=2)
+        """
+        Save patterns to file, folding in any logged trials.
+
+        Set TOKEN_CRAFT_FSYNC=1 to flush the file to disk before the trial
+        log is removed; by default a crash right after saving can lose the
+        trials since the previous save.
+        """
+        # Serialize before truncating, so a failure leaves the old file intact
+        payload = dumps(self.patterns, indent=True)
+        with open(self.patterns_file, 'wb') as f:
+            f.write(payload)
+            if os.environ.get("TOKEN_CRAFT_FSYNC") == "1":
+                f.flush()
+                os.fsync(f.fileno())
+        self.trials_log_file.unlink(missing_ok=True)
+
+    def _append_trial_event(self, event: Dict):
+        """Append one trial to the log instead of rewriting patterns.json."""
+        with open(self.trials_log_file, 'ab') as f:
+            f.write(dumps(event) + b"\n")
+
+    def _read_trial_log(self) -> bytes:
+        """Read the trial log, empty if there is none."""
+        try:
+            return self.trials_log_file.read_bytes()
+        except OSError:
+            return b""
+
+    def _replay_trials(self, data: bytes):
+        """Apply logged trials on top of the loaded patterns, then compact."""
+        for line in data.splitlines():
+            try:
+                self._apply_trial(loads(line))
+            except (ValueError, KeyError, TypeError):
+                # Torn or malformed line
+                continue
+
+        self._save_patterns()
 
     def _seed_default_patterns(self):
         """Seed library with known optimization patterns."""
-        default_patterns = [
-            {
-                "id": "pattern_defer_docs",
-                "name": "Defer Documentation",
-                "category": "workflow",
-                "description": "Delay all documentation until code is ready to push",
-                "evidence": {
-                    "trials": 0,
-                    "success_count": 0,
-                    "failure_count": 0,
-                    "success_rate": 0.0,
-                    "avg_improvement": 0.0,
-                    "confidence": 0.0
-                },
-                "examples": [],
-                "implementation_guide": {
-                    "setup_steps": [
-                        "Add 'Defer documentation until ready to push' to CLAUDE.md",
-                        "Use phrases like 'skip docs for now' in prompts"
-                    ],
-                    "validation_criteria": "No doc-related tokens in first 80% of sessions",
-                    "expected_roi": "25-35% token savings"
-                },
-                "retirement_criteria": {
-                    "min_trials": 10,
-                    "min_success_rate": 0.70
-                },
-                "status": "experimental",
-                "created_at": datetime.now().isoformat()
-            },
-            {
-                "id": "pattern_claude_md",
-                "name": "CLAUDE.md Setup",
-                "category": "configuration",
-                "description": "Create CLAUDE.md files in projects with context and preferences",
-                "evidence": {
-                    "trials": 0,
-                    "success_count": 0,
-                    "failure_count": 0,
-                    "success_rate": 0.0,
-                    "avg_improvement": 0.0,
-                    "confidence": 0.0
-                },
-                "examples": [],
-                "implementation_guide": {
-                    "setup_steps": [
-                        "Create CLAUDE.md in project root",
-                        "Add project overview, tech stack, coding preferences"
-                    ],
-                    "validation_criteria": "CLAUDE.md exists and is >500 bytes",
-                    "expected_roi": "1500-2500 tokens saved per session"
-                },
-                "retirement_criteria": {
-                    "min_trials": 10,
-                    "min_success_rate": 0.70
-                },
-                "status": "experimental",
-                "created_at": datetime.now().isoformat()
-            },
-            {
-                "id": "pattern_concise_prompts",
-                "name": "Concise Prompts",
-                "category": "communication",
-                "description": "Use short, direct prompts without pleasantries",
-                "evidence": {
-                    "trials": 0,
-                    "success_count": 0,
-                    "failure_count": 0,
-                    "success_rate": 0.0,
-                    "avg_improvement": 0.0,
-                    "confidence": 0.0
-                },
-                "examples": [],
-                "implementation_guide": {
-                    "setup_steps": [
-                        "Remove 'please', 'could you', 'thank you' from prompts",
-                        "Be direct: 'Edit file.py' vs 'Could you please edit file.py'"
-                    ],
-                    "validation_criteria": "Avg message length <150 chars",
-                    "expected_roi": "10-20% token savings on inputs"
-                },
-                "retirement_criteria": {
-                    "min_trials": 10,
-                    "min_success_rate": 0.70
-                },
-                "status": "experimental",
-                "created_at": datetime.now().isoformat()
-            },
-            {
-                "id": "pattern_fast_mode",
-                "name": "Fast Mode Usage",
-                "category": "efficiency",
-                "description": "Use /fast mode for simple, straightforward tasks",
-                "evidence": {
-                    "trials": 0,
-                    "success_count": 0,
-                    "failure_count": 0,
-                    "success_rate": 0.0,
-                    "avg_improvement": 0.0,
-                    "confidence": 0.0
-                },
-                "examples": [],
-                "implementation_guide": {
-                    "setup_steps": [
-                        "Type /fast before simple tasks",
-                        "Use for file edits, simple debugging, quick queries"
-                    ],
-                    "validation_criteria": "Sessions with /fast have lower token usage",
-                    "expected_roi": "Faster responses, potentially lower tokens"
-                },
-                "retirement_criteria": {
-                    "min_trials": 10,
-                    "min_success_rate": 0.70
-                },
-                "status": "experimental",
-                "created_at": datetime.now().isoformat()
-            }
-        ]
-
-        self.patterns["patterns"].extend(default_patterns)
+        created_at = datetime.now().isoformat()
+        self.patterns["patterns"].extend(
+            {**copy.deepcopy(pattern), "created_at": created_at}
+            for pattern in DEFAULT_PATTERNS
+        )
         self._save_patterns()
 
+    def _index_patterns(self):
+        """Rebuild the pattern ID index; call after replacing the pattern list."""
+        self._by_id = {p["id"]: p for p in self.patterns["patterns"]}
+
     def _find_pattern(self, pattern_id: str) -> Optional[Dict]:
         """Find pattern by ID."""
-        for pattern in self.patterns["patterns"]:
-            if pattern["id"] == pattern_id:
-                return pattern
-        return None
+        return self._by_id.get(pattern_id)
 
     def record_trial(
         self,
@@ -192,6 +246,9 @@ class PatternLibrary:
         """
         Record a trial of a pattern.
 
+        The trial is applied in memory and appended to the trial log;
+        patterns.json is rewritten on the next full save or load.
+
         Args:
             pattern_id: Pattern ID
             success: Whether trial was successful
@@ -204,10 +261,44 @@ class PatternLibrary:
         if not pattern:
             return
 
+        event = {
+            "pattern_id": pattern_id,
+            "trial": pattern["evidence"]["trials"] + 1,
+            "success": success,
+            "before_tokens": before_tokens,
+            "after_tokens": after_tokens,
+            "session_id": session_id,
+            "details": details,
+            "recorded_at": datetime.now().isoformat()
+        }
+        self._apply_trial(event)
+        self._append_trial_event(event)
+
+    def _apply_trial(self, event: Dict) -> bool:
+        """
+        Update a pattern's evidence from a trial event.
+
+        Events carry the trial number they produce, so an event that is
+        already reflected in the pattern (e.g. replayed after a crash
+        between saving and clearing the log) is skipped.
+
+        Returns:
+            True if the event was applied
+        """
+        pattern = self._find_pattern(event["pattern_id"])
+        if not pattern:
+            return False
+
         # Update evidence
         evidence = pattern["evidence"]
+        if evidence["trials"] != event["trial"] - 1:
+            return False
         evidence["trials"] += 1
 
+        success = event["success"]
+        before_tokens = event["before_tokens"]
+        after_tokens = event["after_tokens"]
+
         if success:
             evidence["success_count"] += 1
         else:
@@ -222,13 +313,23 @@ class PatternLibrary:
         else:
             improvement = 0
 
-        # Update average improvement (only from successful trials)
+        # Update average improvement (only from successful trials) with
+        # Welford's update; the mean is kept unrounded so it does not drift
+        # over long runs, and improvement_m2 accumulates squared deviations
         if success:
-            # Weighted average
             current_avg = evidence.get("avg_improvement", 0)
-            success_count = evidence["success_count"]
-            new_avg = ((current_avg * (success_count - 1)) + improvement) / success_count
-            evidence["avg_improvement"] = round(new_avg, 1)
+            delta = improvement - current_avg
+            new_avg = current_avg + delta / evidence["success_count"]
+            evidence["avg_improvement"] = new_avg
+
+            # Evidence recorded before the spread was tracked has no M2;
+            # it stays unknown rather than restarting from zero
+            if evidence["success_count"] == 1:
+                m2 = 0.0
+            else:
+                m2 = evidence.get("improvement_m2")
+            if m2 is not None:
+                evidence["improvement_m2"] = m2 + delta * (improvement - new_avg)
 
         # Update confidence (based on sample size and consistency)
         if evidence["trials"] >= 10:
@@ -246,19 +347,19 @@ class PatternLibrary:
         # Add example
         if success and len(pattern["examples"]) < 10:
             example = {
-                "session_id": session_id,
+                "session_id": event["session_id"],
                 "before_tokens": before_tokens,
                 "after_tokens": after_tokens,
                 "improvement": round(improvement, 1),
-                "details": details,
-                "recorded_at": datetime.now().isoformat()
+                "details": event["details"],
+                "recorded_at": event["recorded_at"]
             }
             pattern["examples"].append(example)
 
         # Update status based on validation
         pattern["status"] = self._determine_pattern_status(pattern)
 
-        self._save_patterns()
+        return True
 
     def _determine_pattern_status(self, pattern: Dict) -> str:
         """
@@ -305,6 +406,17 @@ class PatternLibrary:
         success_rate = evidence["success_rate"]
         avg_improvement = evidence["avg_improvement"]
 
+        # Sample standard deviation of improvement across successful trials;
+        # None if the evidence predates spread tracking
+        success_count = evidence["success_count"]
+        m2 = evidence.get("improvement_m2")
+        if success_count < 2:
+            improvement_stdev = 0.0
+        elif m2 is None:
+            improvement_stdev = None
+        else:
+            improvement_stdev = round(math.sqrt(m2 / (success_count - 1)), 1)
+
         # Simple significance test
         if trials >= 10:
             if success_rate >= 0.7 and avg_improvement >= 15:
@@ -334,7 +446,8 @@ class PatternLibrary:
             "status": status,
             "trials": trials,
             "success_rate": success_rate,
-            "avg_improvement": avg_improvement,
+            "avg_improvement": round(avg_improvement, 1),
+            "improvement_stdev": improvement_stdev,
             "confidence": evidence["confidence"],
             "significance": significance,
             "p_value": p_value,
@@ -365,51 +478,84 @@ class PatternLibrary:
             if p["evidence"]["trials"] >= 3 and p["status"] != "deprecated"
         ]
 
-        # Sort by average improvement
-        sorted_patterns = sorted(
+        # Highest average improvement first; same order as a stable sort
+        return heapq.nlargest(
+            limit,
             qualified,
-            key=lambda p: p["evidence"]["avg_improvement"],
-            reverse=True
+            key=lambda p: p["evidence"]["avg_improvement"]
         )
 
-        return sorted_patterns[:limit]
-
     def discover_new_patterns(self, sessions: List[Dict]) -> List[Dict]:
         """
         Auto-discover successful patterns from usage history.
 
+        Candidates are saved with a signature of the history they came from,
+        so re-running on unchanged history returns them without rescanning.
+        patterns.json is only rewritten when the history has changed.
+
         Args:
             sessions: List of session data
 
         Returns:
             List of candidate patterns
         """
+        signature = self._discovery_signature(sessions)
+        last_discovery = self.patterns.get("last_discovery")
+        if last_discovery and last_discovery.get("signature") == signature:
+            return [dict(c) for c in last_discovery.get("candidates", [])]
+
+        candidates = self._find_pattern_candidates(sessions)
+
+        self.patterns["last_discovery"] = {
+            "signature": signature,
+            "candidates": candidates
+        }
+        # Key older versions kept a bare signature under
+        self.patterns.pop("last_discovery_signature", None)
+        self._save_patterns()
+
+        return [dict(c) for c in candidates]
+
+    @staticmethod
+    def _discovery_signature(sessions: List[Dict]) -> List:
+        """
+        Cheap fingerprint of session history.
+
+        History is append-only, so the count plus the identity of the last
+        session changes whenever new data arrives. Kept as a list so it
+        compares equal after a JSON round trip.
+        """
+        if not sessions:
+            return [0, None, None]
+
+        last = sessions[-1]
+        return [len(sessions), last.get("timestamp"), last.get("sessionId")]
+
+    def _find_pattern_candidates(self, sessions: List[Dict]) -> List[Dict]:
+        """Scan sessions for characteristics shared by efficient ones."""
         candidates = []
 
-        # Calculate average tokens across all sessions
-        all_tokens = []
-        for session in sessions:
-            session_tokens = sum(
-                msg.get("tokens", 0)
-                for msg in session.get("messages", [])
-            )
-            if session_tokens > 0:
-                all_tokens.append(session_tokens)
+        # Total tokens per session, computed once and reused for the filter
+        session_tokens = [
+            sum(msg.get("tokens", 0) for msg in session.get("messages", []))
+            for session in sessions
+        ]
+        all_tokens = [tokens for tokens in session_tokens if tokens > 0]
 
         if not all_tokens:
             return candidates
 
-        avg_tokens = statistics.mean(all_tokens)
+        # Int sum over int count is already correctly rounded, without the
+        # Fraction arithmetic statistics.mean does
+        avg_tokens = sum(all_tokens) / len(all_tokens)
 
-        # Find sessions with below-average tokens
-        efficient_sessions = []
-        for session in sessions:
-            session_tokens = sum(
-                msg.get("tokens", 0)
-                for msg in session.get("messages", [])
-            )
-            if session_tokens > 0 and session_tokens < avg_tokens * 0.8:  # 20% below avg
-                efficient_sessions.append(session)
+        # Find sessions with below-average tokens (20% below avg)
+        threshold = avg_tokens * 0.8
+        efficient_sessions = [
+            session
+            for session, tokens in zip(sessions, session_tokens)
+            if 0 < tokens < threshold
+        ]
 
         # Extract common characteristics
         if len(efficient_sessions) >= 5:
@@ -443,14 +589,12 @@ class PatternLibrary:
         lines.append("")
 
         # Count by status
-        experimental = sum(1 for p in self.patterns["patterns"] if p["status"] == "experimental")
-        validated = sum(1 for p in self.patterns["patterns"] if p["status"] == "validated")
-        deprecated = sum(1 for p in self.patterns["patterns"] if p["status"] == "deprecated")
+        status_counts = Counter(p["status"] for p in self.patterns["patterns"])
 
         lines.append(f"Total patterns: {len(self.patterns['patterns'])}")
-        lines.append(f"  Validated: {validated}")
-        lines.append(f"  Experimental: {experimental}")
-        lines.append(f"  Deprecated: {deprecated}")
+        lines.append(f"  Validated: {status_counts['validated']}")
+        lines.append(f"  Experimental: {status_counts['experimental']}")
+        lines.append(f"  Deprecated: {status_counts['deprecated']}")
         lines.append("")
 
         # Show top validated patterns
@@ -458,13 +602,18 @@ class PatternLibrary:
         if top_patterns:
             lines.append("Top Validated Patterns:")
             lines.append("-" * 70)
-            for pattern in top_patterns:
-                evidence = pattern["evidence"]
-                lines.append(f"  {pattern['name']}")
-                lines.append(f"    Success rate: {evidence['success_rate']*100:.0f}%")
-                lines.append(f"    Avg improvement: {evidence['avg_improvement']:.1f}%")
-                lines.append(f"    Trials: {evidence['trials']}")
-                lines.append(f"    Status: {pattern['status'].upper()}")
-                lines.append("")
+            lines.extend(self._format_pattern(pattern) for pattern in top_patterns)
 
         return "\n".join(lines)
+
+    @staticmethod
+    def _format_pattern(pattern: Dict) -> str:
+        """Format one pattern's evidence as a newline-terminated block."""
+        evidence = pattern["evidence"]
+        return (
+            f"  {pattern['name']}\n"
+            f"    Success rate: {evidence['success_rate']*100:.0f}%\n"
+            f"    Avg improvement: {evidence['avg_improvement']:.1f}%\n"
+            f"    Trials: {evidence['trials']}\n"
+            f"    Status: {pattern['status'].upper()}\n"
+        )
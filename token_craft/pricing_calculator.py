@@ -5,9 +5,21 @@ Calculates costs based on flexible pricing configuration.
 Supports multiple deployment methods (Direct API, Bedrock, Vertex).
 """
 
-import json
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from ._jsonio import dumps, loads
+
+
+class _ModelPrices(NamedTuple):
+    """One model's prices on one deployment, per million tokens."""
+
+    input: Optional[float]
+    output: Optional[float]
+    cache_write: Optional[float]
+    cache_read: Optional[float]
+    # Shown when the model has no input/output price on this deployment
+    note: Optional[str]
 
 
 class PricingCalculator:
@@ -25,16 +37,69 @@ class PricingCalculator:
 
         self.config = self._load_config(pricing_config_path)
         self.deployment_methods = self.config.get("deployment_methods", {})
+        self._price_table = self._build_price_table(self.deployment_methods)
 
     def _load_config(self, config_path: Path) -> Dict:
         """Load pricing configuration from JSON file."""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(config_path, 'rb') as f:
+                return loads(f.read())
         except Exception as e:
             print(f"Warning: Could not load pricing config: {e}")
             return {}
 
+    @staticmethod
+    def _build_price_table(
+        deployment_methods: Dict
+    ) -> Dict[Tuple[str, str], _ModelPrices]:
+        """
+        Flatten model pricing into one lookup keyed by (deployment, model).
+
+        Returns:
+            Dict of _ModelPrices, skipping models with no pricing entry
+        """
+        price_table = {}
+        for deployment, deployment_config in deployment_methods.items():
+            for model, model_pricing in deployment_config.get("models", {}).items():
+                if not model_pricing:
+                    continue
+                price_table[(deployment, model)] = _ModelPrices(
+                    model_pricing.get("input_price"),
+                    model_pricing.get("output_price"),
+                    model_pricing.get("cache_write_price"),
+                    model_pricing.get("cache_read_price"),
+                    model_pricing.get("note", "Contact provider for pricing")
+                )
+        return price_table
+
+    def _total_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        model: str,
+        deployment: str
+    ) -> Optional[float]:
+        """
+        Uncached total cost, rounded as calculate_cost rounds it.
+
+        For callers that only need the total; skips building the breakdown.
+
+        Returns:
+            Total cost, or None where calculate_cost would report an error
+        """
+        prices = self._price_table.get((deployment, model))
+        if prices is None:
+            return None
+
+        if prices.input is None or prices.output is None:
+            return None
+
+        return round(
+            (input_tokens / 1_000_000) * prices.input
+            + (output_tokens / 1_000_000) * prices.output,
+            4
+        )
+
     def calculate_cost(
         self,
         input_tokens: int,
@@ -58,67 +123,58 @@ class PricingCalculator:
         Returns:
             Dict with cost breakdown
         """
-        # Get pricing for deployment method
-        deployment_config = self.deployment_methods.get(deployment, {})
-        models = deployment_config.get("models", {})
-        model_pricing = models.get(model, {})
-
-        if not model_pricing:
+        # Get prices (per million tokens)
+        prices = self._price_table.get((deployment, model))
+        if prices is None:
             return {
                 "error": f"Model {model} not found in {deployment}",
                 "total_cost": 0,
                 "breakdown": {}
             }
 
-        # Get prices (per million tokens)
-        input_price = model_pricing.get("input_price")
-        output_price = model_pricing.get("output_price")
-        cache_write_price = model_pricing.get("cache_write_price")
-        cache_read_price = model_pricing.get("cache_read_price")
-
-        if input_price is None or output_price is None:
+        if prices.input is None or prices.output is None:
             return {
                 "error": f"Pricing not available for {model} on {deployment}",
                 "total_cost": 0,
                 "breakdown": {},
-                "note": model_pricing.get("note", "Contact provider for pricing")
+                "note": prices.note
             }
 
         # Calculate costs
         breakdown = {}
 
         # Input tokens cost
-        if use_cache and cache_write_price:
+        if use_cache and prices.cache_write:
             # With caching, writing to cache costs more
-            input_cost = (input_tokens / 1_000_000) * cache_write_price
+            input_cost = (input_tokens / 1_000_000) * prices.cache_write
             breakdown["cache_write"] = {
                 "tokens": input_tokens,
-                "price_per_million": cache_write_price,
+                "price_per_million": prices.cache_write,
                 "cost": input_cost
             }
         else:
-            input_cost = (input_tokens / 1_000_000) * input_price
+            input_cost = (input_tokens / 1_000_000) * prices.input
             breakdown["input"] = {
                 "tokens": input_tokens,
-                "price_per_million": input_price,
+                "price_per_million": prices.input,
                 "cost": input_cost
             }
 
         # Cache read cost
         cache_cost = 0
-        if use_cache and cache_read_tokens > 0 and cache_read_price:
-            cache_cost = (cache_read_tokens / 1_000_000) * cache_read_price
+        if use_cache and cache_read_tokens > 0 and prices.cache_read:
+            cache_cost = (cache_read_tokens / 1_000_000) * prices.cache_read
             breakdown["cache_read"] = {
                 "tokens": cache_read_tokens,
-                "price_per_million": cache_read_price,
+                "price_per_million": prices.cache_read,
                 "cost": cache_cost
             }
 
         # Output tokens cost
-        output_cost = (output_tokens / 1_000_000) * output_price
+        output_cost = (output_tokens / 1_000_000) * prices.output
         breakdown["output"] = {
             "tokens": output_tokens,
-            "price_per_million": output_price,
+            "price_per_million": prices.output,
             "cost": output_cost
         }
 
@@ -199,28 +255,29 @@ class PricingCalculator:
             Dict with savings breakdown
         """
         # Current cost
-        current_input = int(current_tokens * input_ratio)
-        current_output = int(current_tokens * (1 - input_ratio))
-        current_cost_data = self.calculate_cost(
-            current_input, current_output, model, deployment
+        current_cost = self._total_cost(
+            int(current_tokens * input_ratio),
+            int(current_tokens * (1 - input_ratio)),
+            model,
+            deployment
         )
+        if current_cost is None:
+            return {"error": "Could not calculate savings"}
 
-        # Optimized cost
-        optimized_input = int(optimized_tokens * input_ratio)
-        optimized_output = int(optimized_tokens * (1 - input_ratio))
-        optimized_cost_data = self.calculate_cost(
-            optimized_input, optimized_output, model, deployment
+        # Optimized cost; same model and deployment, so it is priced too
+        optimized_cost = self._total_cost(
+            int(optimized_tokens * input_ratio),
+            int(optimized_tokens * (1 - input_ratio)),
+            model,
+            deployment
         )
 
-        if "error" in current_cost_data or "error" in optimized_cost_data:
-            return {"error": "Could not calculate savings"}
-
-        savings = current_cost_data["total_cost"] - optimized_cost_data["total_cost"]
-        savings_percent = (savings / current_cost_data["total_cost"] * 100) if current_cost_data["total_cost"] > 0 else 0
+        savings = current_cost - optimized_cost
+        savings_percent = (savings / current_cost * 100) if current_cost > 0 else 0
 
         return {
-            "current_cost": current_cost_data["total_cost"],
-            "optimized_cost": optimized_cost_data["total_cost"],
+            "current_cost": current_cost,
+            "optimized_cost": optimized_cost,
             "savings": round(savings, 4),
             "savings_percent": round(savings_percent, 1),
             "tokens_saved": current_tokens - optimized_tokens,
@@ -262,13 +319,13 @@ class PricingCalculator:
 
         for deployment_name, deployment_config in self.deployment_methods.items():
             if model in deployment_config.get("models", {}):
-                cost_data = self.calculate_cost(
+                cost = self._total_cost(
                     input_tokens, output_tokens, model, deployment_name
                 )
                 results[deployment_name] = {
                     "name": deployment_config.get("name"),
-                    "cost": cost_data.get("total_cost", 0),
-                    "available": "error" not in cost_data
+                    "cost": 0 if cost is None else cost,
+                    "available": cost is not None
                 }
 
         return results
@@ -296,8 +353,8 @@ class PricingCalculator:
         try:
             # Load existing profile
             if profile_path.exists():
-                with open(profile_path, 'r', encoding='utf-8') as f:
-                    profile = json.load(f)
+                with open(profile_path, 'rb') as f:
+                    profile = loads(f.read())
             else:
                 profile = {}
 
@@ -307,8 +364,8 @@ class PricingCalculator:
 
             # Save
             profile_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(profile_path, 'w', encoding='utf-8') as f:
-                json.dump(profile, f, indent=2)
+            with open(profile_path, 'wb') as f:
+                f.write(dumps(profile, indent=True))
 
             return True
 
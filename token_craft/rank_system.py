@@ -5,9 +5,28 @@ Space Exploration Rank System
 Updated for v3.0 - 2300 total points (exponential progression, 3-6 months to max).
 """
 
+import bisect
+import functools
 from typing import Dict, Optional
 
 
+def _render_badge(rank: Dict) -> str:
+    """Render the ASCII art badge for one rank."""
+    icon = rank["icon"]
+    name = rank["name"].upper()
+
+    # Create ASCII badge
+    border_len = max(len(name) + 4, 20)
+    border = "=" * border_len
+
+    badge = f"""
+{border}
+  {icon}  {name}  {icon}
+{border}
+"""
+    return badge.strip()
+
+
 class SpaceRankSystem:
     """Manage space exploration ranks and progression."""
 
@@ -96,6 +115,25 @@ class SpaceRankSystem:
         },
     ]
 
+    # Rank lower bounds in ascending order, for bisecting a score into a rank
+    _RANK_MINS = tuple(rank["min"] for rank in RANKS)
+
+    # Ranks keyed by lowercased name, for name lookups
+    _RANKS_BY_NAME = {rank["name"].lower(): rank for rank in RANKS}
+
+    # ASCII badges keyed by exact rank name; ranks are fixed, so render once
+    _BADGES = {rank["name"]: _render_badge(rank) for rank in RANKS}
+
+    @classmethod
+    def _rank_index(cls, score: float) -> int:
+        """
+        Index into RANKS of the rank a score falls in.
+
+        Scores between one rank's max and the next rank's min (e.g. 99.5)
+        belong to the lower rank; scores below zero count as Cadet.
+        """
+        return max(bisect.bisect_right(cls._RANK_MINS, score) - 1, 0)
+
     @classmethod
     def get_rank(cls, score: int) -> Dict:
         """
@@ -107,19 +145,27 @@ class SpaceRankSystem:
         Returns:
             Dict with rank details including name, range, progress
         """
-        for rank in cls.RANKS:
-            if rank["min"] <= score <= rank["max"]:
-                progress_in_rank = score - rank["min"]
-                rank_range = rank["max"] - rank["min"] + 1
-                progress_pct = (progress_in_rank / rank_range) * 100
-
-                return {
-                    **rank,
-                    "current_score": score,
-                    "progress_in_rank": progress_in_rank,
-                    "rank_range": rank_range,
-                    "progress_pct": progress_pct
-                }
+        # Copy so callers can't mutate the cached result
+        return dict(cls._get_rank_cached(score))
+
+    @classmethod
+    @functools.lru_cache(maxsize=2048, typed=True)
+    def _get_rank_cached(cls, score: int) -> Dict:
+        """Memoized body of get_rank (scores repeat within and across runs)."""
+        index = cls._rank_index(score)
+        rank = cls.RANKS[index]
+        if score <= rank["max"] or index < len(cls.RANKS) - 1:
+            progress_in_rank = score - rank["min"]
+            rank_range = rank["max"] - rank["min"] + 1
+            progress_pct = (progress_in_rank / rank_range) * 100
+
+            return {
+                **rank,
+                "current_score": score,
+                "progress_in_rank": progress_in_rank,
+                "rank_range": rank_range,
+                "progress_pct": progress_pct
+            }
 
         # If score exceeds all ranks, return max rank
         return {
@@ -141,25 +187,25 @@ class SpaceRankSystem:
         Returns:
             Dict with next rank info, or None if at max rank
         """
-        current_rank = cls.get_rank(score)
-
-        # Find next rank in list
-        for i, rank in enumerate(cls.RANKS):
-            if rank["name"] == current_rank["name"]:
-                if i + 1 < len(cls.RANKS):
-                    next_rank = cls.RANKS[i + 1]
-                    points_needed = next_rank["min"] - score
+        next_rank = cls._get_next_rank_cached(score)
+        return dict(next_rank) if next_rank is not None else None
 
-                    return {
-                        **next_rank,
-                        "points_needed": points_needed
-                    }
-                else:
-                    return None  # Already at max rank
-
-        return None
+    @classmethod
+    @functools.lru_cache(maxsize=2048, typed=True)
+    def _get_next_rank_cached(cls, score: int) -> Optional[Dict]:
+        """Memoized body of get_next_rank."""
+        next_index = cls._rank_index(score) + 1
+        if next_index == len(cls.RANKS):
+            return None  # Already at max rank
+
+        next_rank = cls.RANKS[next_index]
+        return {
+            **next_rank,
+            "points_needed": next_rank["min"] - score
+        }
 
     @classmethod
+    @functools.lru_cache(maxsize=2048)
     def get_progress_bar(cls, score: int, width: int = 50, filled_char: str = "█", empty_char: str = "░") -> str:
         """
         Generate ASCII progress bar for current rank.
@@ -178,8 +224,8 @@ class SpaceRankSystem:
             # Map 0-100 score to 0-50% progress for testing purposes
             progress_pct = (score / 100) * 50
         else:
-            rank_info = cls.get_rank(score)
-            progress_pct = rank_info["progress_pct"]
+            # Read-only use, so the memoized rank needs no defensive copy
+            progress_pct = cls._get_rank_cached(score)["progress_pct"]
 
         filled = int((progress_pct / 100) * width)
         empty = width - filled
@@ -197,23 +243,7 @@ class SpaceRankSystem:
         Returns:
             ASCII art representation
         """
-        rank = next((r for r in cls.RANKS if r["name"] == rank_name), None)
-        if not rank:
-            return ""
-
-        icon = rank["icon"]
-        name = rank["name"].upper()
-
-        # Create ASCII badge
-        border_len = max(len(name) + 4, 20)
-        border = "=" * border_len
-
-        badge = f"""
-{border}
-  {icon}  {name}  {icon}
-{border}
-"""
-        return badge.strip()
+        return cls._BADGES.get(rank_name, "")
 
     @classmethod
     def calculate_rank_level(cls, score: int) -> int:
@@ -226,11 +256,7 @@ class SpaceRankSystem:
         Returns:
             Rank level from 1 (Cadet) to 10 (Galactic Legend)
         """
-        rank_info = cls.get_rank(score)
-        for i, rank in enumerate(cls.RANKS):
-            if rank["name"] == rank_info["name"]:
-                return i + 1
-        return 1
+        return cls._rank_index(score) + 1
 
     @classmethod
     def get_all_ranks(cls) -> list:
@@ -240,4 +266,4 @@ class SpaceRankSystem:
     @classmethod
     def get_rank_by_name(cls, name: str) -> Optional[Dict]:
         """Get rank details by name."""
-        return next((r for r in cls.RANKS if r["name"].lower() == name.lower()), None)
+        return cls._RANKS_BY_NAME.get(name.lower())
@@ -5,15 +5,19 @@ Tracks recommendations through full lifecycle:
 generation → implementation → impact measurement
 """
 
-import json
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
+from ._jsonio import dumps, loads
+
 
 class RecommendationTracker:
     """Track recommendation lifecycle and measure ROI."""
 
+    # Lifecycle lists of recommendation IDs
+    ID_LISTS = ("pending", "implemented", "dismissed")
+
     def __init__(self):
         """Initialize recommendation tracker."""
         self.token_craft_dir = Path.home() / ".claude" / "token-craft"
@@ -27,25 +31,40 @@ class RecommendationTracker:
 
     def _load_recommendations(self) -> Dict:
         """Load recommendations from file."""
+        data = None
         if self.recommendations_file.exists():
             try:
-                with open(self.recommendations_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.recommendations_file, 'rb') as f:
+                    data = loads(f.read())
             except:
                 pass
 
-        # Default structure
-        return {
-            "recommendations": [],
-            "pending": [],
-            "implemented": [],
-            "dismissed": []
-        }
+        if data is None:
+            # Default structure
+            data = {
+                "recommendations": [],
+                "pending": [],
+                "implemented": [],
+                "dismissed": []
+            }
+
+        # ID lists are held as insertion-ordered dicts for O(1) membership
+        # and removal; _save_recommendations writes them back as lists.
+        # Anything that is not a list (e.g. a hand-edited null) counts as empty
+        for key in self.ID_LISTS:
+            ids = data.get(key)
+            data[key] = dict.fromkeys(ids if isinstance(ids, list) else [])
+
+        return data
 
     def _save_recommendations(self):
         """Save recommendations to file."""
-        with open(self.recommendations_file, 'w', encoding='utf-8') as f:
-            json.dump(self.recommendations, f, indent=2)
+        data = dict(self.recommendations)
+        for key in self.ID_LISTS:
+            data[key] = list(data[key])
+
+        with open(self.recommendations_file, 'wb') as f:
+            f.write(dumps(data, indent=True))
 
     def track_recommendation(
         self,
@@ -81,7 +100,7 @@ class RecommendationTracker:
         }
 
         self.recommendations["recommendations"].append(recommendation)
-        self.recommendations["pending"].append(rec_id)
+        self.recommendations["pending"][rec_id] = None
         self._save_recommendations()
 
     def _find_recommendation(self, rec_id: str) -> Optional[Dict]:
@@ -272,10 +291,8 @@ class RecommendationTracker:
         rec["current_metrics"] = current_metrics
 
         # Update lists
-        if rec_id in self.recommendations["pending"]:
-            self.recommendations["pending"].remove(rec_id)
-        if rec_id not in self.recommendations["implemented"]:
-            self.recommendations["implemented"].append(rec_id)
+        self.recommendations["pending"].pop(rec_id, None)
+        self.recommendations["implemented"].setdefault(rec_id)
 
         # Calculate impact
         rec["impact"] = self.calculate_roi(rec_id)
@@ -26,8 +26,9 @@ v3.0 Features:
 """
 
 import json
+import math
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from datetime import datetime, timedelta
 import statistics
 
@@ -38,6 +39,16 @@ from .time_based_mechanics import TimeBasedMechanics
 from .regression_detector import RegressionDetector
 
 
+def _sample_stdev(values: Sequence[float], mean: float) -> float:
+    """
+    Sample standard deviation using float arithmetic.
+
+    statistics.stdev converts every value to an exact fraction, which
+    dominates scoring time on large histories.
+    """
+    return math.sqrt(math.fsum((v - mean) ** 2 for v in values) / (len(values) - 1))
+
+
 class TokenCraftScorer:
     """Calculate token optimization scores."""
 
@@ -81,6 +92,46 @@ class TokenCraftScorer:
         "optimization_adoption_rate": 0.30,
     }
 
+    # Keyword heuristics, matched against lowercased text unless noted
+    DOC_KEYWORDS = ("readme", "documentation", "comment", "docstring", "docs")
+    DEFER_KEYWORDS = ("defer", "later", "skip", "wait", "after")
+    SIMPLE_COMMAND_KEYWORDS = (
+        "git log",
+        "git status",
+        "cat ",
+        "ls ",
+        "grep ",
+        "show me",
+    )
+    # Case-sensitive: matched against the original text
+    XML_KEYWORDS = (
+        "<document>",
+        "<task>",
+        "<context>",
+        "<example>",
+        "<input>",
+        "<output>",
+        "</",
+    )
+    COT_KEYWORDS = (
+        "let's think",
+        "step by step",
+        "reasoning:",
+        "because",
+        "first",
+        "then",
+        "therefore",
+        "analyze",
+    )
+    EXAMPLE_KEYWORDS = (
+        "for example",
+        "e.g.",
+        "such as",
+        "like this:",
+        "here's an example",
+        "example:",
+    )
+
     def __init__(
         self,
         history_data: List[Dict],
@@ -132,6 +183,7 @@ class TokenCraftScorer:
         self.sessions = self._group_by_sessions()
         self.total_sessions = len(self.sessions)
         self.total_messages = sum(len(s["messages"]) for s in self.sessions)
+        self._prepare_message_text()
 
         # Calculate tokens
         self.total_tokens = self._calculate_total_tokens()
@@ -142,6 +194,35 @@ class TokenCraftScorer:
         # Calculate dynamic baseline
         self.dynamic_baseline = self._calculate_dynamic_baseline()
 
+    def _prepare_message_text(self):
+        """
+        Extract message text once for all keyword heuristics.
+
+        Each session's messages are joined with newlines (no keyword
+        contains one), so "any message matches" becomes one substring
+        search per keyword instead of one per keyword per message.
+        """
+        self.session_texts = []
+        self.session_texts_lower = []
+        self.message_texts_lower = []
+        self.total_message_chars = 0
+
+        for session in self.sessions:
+            texts = [msg.get("message", "") for msg in session["messages"]]
+            lowered = [text.lower() for text in texts]
+
+            self.session_texts.append("\n".join(texts))
+            self.session_texts_lower.append("\n".join(lowered))
+            self.message_texts_lower.extend(lowered)
+            self.total_message_chars += sum(len(text) for text in texts)
+
+    def _count_sessions_matching(
+        self, keywords: Sequence[str], lower: bool = True
+    ) -> int:
+        """Count sessions with at least one message containing a keyword."""
+        texts = self.session_texts_lower if lower else self.session_texts
+        return sum(1 for text in texts if any(kw in text for kw in keywords))
+
     def _group_by_sessions(self) -> List[Dict]:
         """Group history data by session."""
         sessions = {}
@@ -223,7 +304,7 @@ class TokenCraftScorer:
             p25_index = 1
 
         best_sessions = session_tokens_sorted[:p25_index]
-        best_avg = statistics.mean(best_sessions)
+        best_avg = statistics.fmean(best_sessions)
 
         # Set baseline as 90% of best quartile (10% improvement target)
         dynamic_baseline = best_avg * 0.90
@@ -423,28 +504,13 @@ class TokenCraftScorer:
     def _check_defer_documentation(self) -> Dict:
         """Check if user defers documentation until ready to push."""
         # Heuristic: Look for documentation keywords in messages
-        doc_keywords = ["readme", "documentation", "comment", "docstring", "docs"]
-        defer_keywords = ["defer", "later", "skip", "wait", "after"]
-
         doc_sessions = 0
         deferred_sessions = 0
 
-        for session in self.sessions:
-            has_doc_request = False
-            has_defer = False
-
-            for msg in session["messages"]:
-                content = msg.get("message", "").lower()
-
-                if any(kw in content for kw in doc_keywords):
-                    has_doc_request = True
-
-                if any(kw in content for kw in defer_keywords):
-                    has_defer = True
-
-            if has_doc_request:
+        for text in self.session_texts_lower:
+            if any(kw in text for kw in self.DOC_KEYWORDS):
                 doc_sessions += 1
-                if has_defer:
+                if any(kw in text for kw in self.DEFER_KEYWORDS):
                     deferred_sessions += 1
 
         consistency = deferred_sessions / doc_sessions if doc_sessions > 0 else 0.5
@@ -501,14 +567,7 @@ class TokenCraftScorer:
 
         # Also check average message length
         if self.total_messages > 0:
-            avg_msg_length = (
-                sum(
-                    len(msg.get("message", ""))
-                    for session in self.sessions
-                    for msg in session["messages"]
-                )
-                / self.total_messages
-            )
+            avg_msg_length = self.total_message_chars / self.total_messages
 
             # If average message is under 200 chars, consider concise
             if avg_msg_length < 200:
@@ -529,23 +588,13 @@ class TokenCraftScorer:
         # Heuristic: Count tool calls vs opportunities
         # This is simplified - in production, track actual command opportunities
 
-        # Count Read/Bash tool calls (these could be done directly)
-        ai_command_count = 0
-        for session in self.sessions:
-            for msg in session["messages"]:
-                # Check if AI was asked to run simple commands
-                content = msg.get("message", "").lower()
-                simple_cmds = [
-                    "git log",
-                    "git status",
-                    "cat ",
-                    "ls ",
-                    "grep ",
-                    "show me",
-                ]
-
-                if any(cmd in content for cmd in simple_cmds):
-                    ai_command_count += 1
+        # Count messages asking the AI to run simple commands
+        # (Read/Bash tool calls that could be done directly)
+        ai_command_count = sum(
+            1
+            for content in self.message_texts_lower
+            if any(cmd in content for cmd in self.SIMPLE_COMMAND_KEYWORDS)
+        )
 
         # Estimate opportunities (rough heuristic)
         total_opportunities = (
@@ -602,23 +651,7 @@ class TokenCraftScorer:
         Anthropic recommends structuring prompts with XML tags like:
         <document>, <task>, <context>, <example>, etc.
         """
-        xml_keywords = [
-            "<document>",
-            "<task>",
-            "<context>",
-            "<example>",
-            "<input>",
-            "<output>",
-            "</",
-        ]
-
-        xml_sessions = 0
-        for session in self.sessions:
-            for msg in session["messages"]:
-                content = msg.get("message", "")
-                if any(kw in content for kw in xml_keywords):
-                    xml_sessions += 1
-                    break  # Count session once
+        xml_sessions = self._count_sessions_matching(self.XML_KEYWORDS, lower=False)
 
         consistency = (
             xml_sessions / self.total_sessions if self.total_sessions > 0 else 0
@@ -641,24 +674,7 @@ class TokenCraftScorer:
         Anthropic recommends using CoT prompts like:
         "let's think step by step", "reasoning:", "because", etc.
         """
-        cot_keywords = [
-            "let's think",
-            "step by step",
-            "reasoning:",
-            "because",
-            "first",
-            "then",
-            "therefore",
-            "analyze",
-        ]
-
-        cot_sessions = 0
-        for session in self.sessions:
-            for msg in session["messages"]:
-                content = msg.get("message", "").lower()
-                if any(kw in content for kw in cot_keywords):
-                    cot_sessions += 1
-                    break  # Count session once
+        cot_sessions = self._count_sessions_matching(self.COT_KEYWORDS)
 
         consistency = (
             cot_sessions / self.total_sessions if self.total_sessions > 0 else 0
@@ -681,22 +697,7 @@ class TokenCraftScorer:
         Anthropic recommends providing examples like:
         "for example", "e.g.", "such as", "like this:", etc.
         """
-        example_keywords = [
-            "for example",
-            "e.g.",
-            "such as",
-            "like this:",
-            "here's an example",
-            "example:",
-        ]
-
-        example_sessions = 0
-        for session in self.sessions:
-            for msg in session["messages"]:
-                content = msg.get("message", "").lower()
-                if any(kw in content for kw in example_keywords):
-                    example_sessions += 1
-                    break  # Count session once
+        example_sessions = self._count_sessions_matching(self.EXAMPLE_KEYWORDS)
 
         consistency = (
             example_sessions / self.total_sessions if self.total_sessions > 0 else 0
@@ -1324,8 +1325,8 @@ class TokenCraftScorer:
         recent_avg = 0.0
         improvement = 0.0
         if early_tokens and recent_tokens:
-            early_avg = statistics.mean(early_tokens)
-            recent_avg = statistics.mean(recent_tokens)
+            early_avg = statistics.fmean(early_tokens)
+            recent_avg = statistics.fmean(recent_tokens)
             improvement = (
                 ((early_avg - recent_avg) / early_avg) * 100 if early_avg > 0 else 0
             )
@@ -1369,8 +1370,8 @@ class TokenCraftScorer:
         recent_msg_counts = [len(s.get("messages", [])) for s in recent_sessions]
 
         if early_msg_counts and recent_msg_counts:
-            early_avg_msgs = statistics.mean(early_msg_counts)
-            recent_avg_msgs = statistics.mean(recent_msg_counts)
+            early_avg_msgs = statistics.fmean(early_msg_counts)
+            recent_avg_msgs = statistics.fmean(recent_msg_counts)
 
             # Lower message count = more autonomy (doing more yourself)
             if recent_avg_msgs < early_avg_msgs * 0.8:  # 20%+ reduction
@@ -1434,9 +1435,11 @@ class TokenCraftScorer:
 
         if message_lengths and len(message_lengths) > 10:
             # Calculate coefficient of variation
-            mean_length = statistics.mean(message_lengths)
+            mean_length = statistics.fmean(message_lengths)
             std_dev = (
-                statistics.stdev(message_lengths) if len(message_lengths) > 1 else 0
+                _sample_stdev(message_lengths, mean_length)
+                if len(message_lengths) > 1
+                else 0
             )
 
             # High variation (CV > 0.5) indicates attempts at varied prompt lengths
@@ -1456,8 +1459,8 @@ class TokenCraftScorer:
         if len(session_tokens) >= 5:
             # Compare first 1/3 vs last 1/3
             third = len(session_tokens) // 3
-            early_avg = statistics.mean(session_tokens[:third]) if third > 0 else 0
-            late_avg = statistics.mean(session_tokens[-third:]) if third > 0 else 0
+            early_avg = statistics.fmean(session_tokens[:third]) if third > 0 else 0
+            late_avg = statistics.fmean(session_tokens[-third:]) if third > 0 else 0
 
             if early_avg > 0 and late_avg < early_avg:
                 improvement = ((early_avg - late_avg) / early_avg) * 100
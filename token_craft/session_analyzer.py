@@ -9,12 +9,13 @@ Reads session-meta and facets from ~/.claude/usage-data/ to detect:
 - Nudge patterns (impatient short messages in long sessions)
 """
 
-import json
 import hashlib
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from ._jsonio import loads
+
 
 class SessionAnalyzer:
     """Analyze session-level efficiency using /insights data."""
@@ -61,9 +62,9 @@ class SessionAnalyzer:
 
         for f in self.session_meta_dir.glob("*.json"):
             try:
-                data = json.loads(f.read_text(encoding="utf-8"))
+                data = loads(f.read_bytes())
                 self._sessions.append(data)
-            except (json.JSONDecodeError, OSError):
+            except (ValueError, OSError):
                 continue
 
         return self._sessions
@@ -79,10 +80,10 @@ class SessionAnalyzer:
 
         for f in self.facets_dir.glob("*.json"):
             try:
-                data = json.loads(f.read_text(encoding="utf-8"))
+                data = loads(f.read_bytes())
                 sid = data.get("session_id", f.stem)
                 self._facets[sid] = data
-            except (json.JSONDecodeError, OSError):
+            except (ValueError, OSError):
                 continue
 
         return self._facets
@@ -287,9 +288,9 @@ class SessionAnalyzer:
         total_messages = 0
         if stats_file.exists():
             try:
-                stats = json.loads(stats_file.read_text(encoding="utf-8"))
+                stats = loads(stats_file.read_bytes())
                 total_messages = stats.get("totalMessages", 0)
-            except (json.JSONDecodeError, OSError):
+            except (ValueError, OSError):
                 pass
 
         # Calculate total impact
@@ -4,15 +4,20 @@ Snapshot Management
 Creates and manages historical snapshots of user progress.
 """
 
-import json
+import os
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from ._jsonio import dumps, loads
+
 
 class SnapshotManager:
     """Manage user progress snapshots."""
 
+    # Top-level snapshot sections, always dicts in loaded snapshots
+    SECTIONS = ("profile", "scores", "rank")
+
     def __init__(self, snapshot_dir: Optional[Path] = None):
         """
         Initialize snapshot manager.
@@ -51,13 +56,43 @@ class SnapshotManager:
             "version": "1.0.0"
         }
 
+        # Write to a temp file and rename so readers never see a partial
+        # snapshot. No fsync: losing the newest snapshot on power loss is
+        # harmless, the next run simply writes another.
+        tmp_path = filepath.with_suffix(".tmp")
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(snapshot, f, indent=2)
+            payload = dumps(snapshot, indent=True)
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, filepath)
             return filename
         except Exception as e:
             raise Exception(f"Failed to create snapshot: {e}")
 
+    @staticmethod
+    def has_changed(
+        previous_snapshot: Optional[Dict], score_data: Dict, rank_data: Dict
+    ) -> bool:
+        """
+        Check whether a new analysis differs from the previous snapshot.
+
+        Args:
+            previous_snapshot: Latest saved snapshot (or None)
+            score_data: Score calculation results
+            rank_data: Rank information
+
+        Returns:
+            True if score or rank changed (or there is no previous snapshot)
+        """
+        if not previous_snapshot:
+            return True
+
+        previous_scores = previous_snapshot.get("scores") or {}
+        previous_rank = previous_snapshot.get("rank") or {}
+        return previous_scores.get("total_score") != score_data.get(
+            "total_score"
+        ) or previous_rank.get("name") != rank_data.get("name")
+
     def get_latest_snapshot(self) -> Optional[Dict]:
         """Get the most recent snapshot."""
         snapshots = self.list_snapshots()
@@ -75,7 +110,8 @@ class SnapshotManager:
             filename: Snapshot filename
 
         Returns:
-            Snapshot data or None if not found
+            Snapshot data or None if not found. Loaded snapshots are always
+            dicts whose SECTIONS are dicts, so callers need no type checks.
         """
         filepath = self.snapshot_dir / filename
 
@@ -83,12 +119,21 @@ class SnapshotManager:
             return None
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(filepath, "rb") as f:
+                snapshot = loads(f.read())
         except Exception as e:
             print(f"Error loading snapshot {filename}: {e}")
             return None
 
+        if not isinstance(snapshot, dict):
+            print(f"Error loading snapshot {filename}: not a JSON object")
+            return None
+
+        for section in self.SECTIONS:
+            if not isinstance(snapshot.get(section), dict):
+                snapshot[section] = {}
+        return snapshot
+
     def list_snapshots(self) -> List[str]:
         """
         List all available snapshots sorted by timestamp.
@@ -172,8 +217,8 @@ class SnapshotManager:
             if snapshot_data:
                 export_path = export_dir / filename
                 try:
-                    with open(export_path, "w", encoding="utf-8") as f:
-                        json.dump(snapshot_data, f, indent=2)
+                    with open(export_path, "wb") as f:
+                        f.write(dumps(snapshot_data, indent=True))
                     exported += 1
                 except Exception as e:
                     print(f"Error exporting {filename}: {e}")
@@ -5,11 +5,51 @@ Stores and manages user token optimization progress.
 Schema v3.0: Includes streak tracking, seasonal scoring, achievements, and legacy v2.0 data.
 """
 
-import json
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, FrozenSet, Optional, Set
 from datetime import datetime
 
+from ._jsonio import dumps, loads
+
+
+def _efficiency_improvement_pct(score_data: Dict) -> float:
+    """Token efficiency improvement over baseline, 0 if unavailable."""
+    efficiency_data = score_data["breakdown"].get("token_efficiency", {})
+    if not isinstance(efficiency_data, dict):
+        return 0
+    return efficiency_data.get("improvement_pct", 0)
+
+
+# Milestone achievements the skill handlers award after each analysis:
+# (achievement_id, title, description, condition(score_data, rank_data))
+ACHIEVEMENT_CHECKS = (
+    (
+        "first_pilot",
+        "First Pilot",
+        "Achieved Pilot rank for the first time",
+        lambda score_data, rank_data: rank_data["name"] == "Pilot",
+    ),
+    (
+        "halfway_there",
+        "Halfway There",
+        "Reached 500 points",
+        lambda score_data, rank_data: score_data["total_score"] >= 500,
+    ),
+    (
+        "four_digits",
+        "Four Digits",
+        "Reached 1000+ points (Admiral level)",
+        lambda score_data, rank_data: score_data["total_score"] >= 1000,
+    ),
+    (
+        "efficiency_master",
+        "Efficiency Master",
+        "Achieved 30%+ better efficiency than baseline",
+        lambda score_data, rank_data: _efficiency_improvement_pct(score_data) >= 30,
+    ),
+)
+ALL_ACHIEVEMENT_IDS = frozenset(check[0] for check in ACHIEVEMENT_CHECKS)
+
 
 class UserProfile:
     """Manage user profile and state."""
@@ -24,7 +64,7 @@ class UserProfile:
             user_email: User's email (optional, will try to detect)
             profile_dir: Custom profile directory (optional)
         """
-        self.user_email = user_email or self._detect_user_email()
+        self.user_email = user_email
 
         # Set profile directory
         if profile_dir:
@@ -38,6 +78,13 @@ class UserProfile:
         # Load or create profile
         self.data = self._load_profile()
 
+        # A saved profile already records the email, so only spawn
+        # `git config` when there is nothing on disk
+        if self.user_email is None:
+            self.user_email = self.data.get("user_email") or self._detect_user_email()
+
+        self._achievement_ids = self._index_achievements()
+
     def _detect_user_email(self) -> str:
         """Try to detect user email from git config."""
         try:
@@ -60,20 +107,27 @@ class UserProfile:
         """Load profile from disk or create new."""
         if self.profile_path.exists():
             try:
-                with open(self.profile_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                with open(self.profile_path, "rb") as f:
+                    return loads(f.read())
             except Exception as e:
                 print(f"Warning: Could not load profile: {e}")
                 return self._create_new_profile()
         else:
             return self._create_new_profile()
 
+    def _index_achievements(self) -> Set[str]:
+        """Build the set of owned achievement IDs from profile data."""
+        achievements = self.data.get("achievements", [])
+        if not isinstance(achievements, list):
+            return set()
+        return {a["id"] for a in achievements if isinstance(a, dict) and "id" in a}
+
     def _create_new_profile(self) -> Dict:
         """Create a new profile structure (v3.0 schema)."""
         now = datetime.now().isoformat()
         return {
             "version": "3.0",
-            "user_email": self.user_email,
+            "user_email": self.user_email or self._detect_user_email(),
             "created_at": now,
             "last_updated": now,
             "current_rank": "Cadet",
@@ -216,8 +270,8 @@ class UserProfile:
     def save(self):
         """Save profile to disk."""
         try:
-            with open(self.profile_path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2)
+            with open(self.profile_path, "wb") as f:
+                f.write(dumps(self.data, indent=True))
             return True
         except Exception as e:
             print(f"Error saving profile: {e}")
@@ -246,12 +300,21 @@ class UserProfile:
         ]
 
         # Don't add duplicates
-        if not any(a.get("id") == achievement_id for a in self.data["achievements"]):
+        if achievement_id not in self._achievement_ids:
             self.data["achievements"].append(achievement)
+            self._achievement_ids.add(achievement_id)
             return True
 
         return False
 
+    def has_achievement(self, achievement_id: str) -> bool:
+        """Check whether an achievement has already been earned."""
+        return achievement_id in self._achievement_ids
+
+    def owned_ids(self) -> FrozenSet[str]:
+        """Get the IDs of all earned achievements."""
+        return frozenset(self._achievement_ids)
+
     def get_achievements(self) -> list:
         """Get all achievements (cleaned up to ensure valid dicts)."""
         achievements = self.data.get("achievements", [])
@@ -81,7 +81,7 @@ class WasteDetector:
                         'type': str,
                         'estimated_waste': int,
                         'frequency': int,
-                        'examples': List[str],
+                        'examples': List[Dict],
                         'recommendation': str
                     },
                     ...
@@ -123,7 +123,7 @@ class WasteDetector:
                 'type': 'repeated_context',
                 'estimated_waste': int,
                 'frequency': int,
-                'examples': List[str],
+                'examples': List[Dict],  # {'snippet': str, 'waste_tokens': int}
                 'sessions_affected': List[str],
                 'recommendation': str
             }
@@ -175,7 +175,10 @@ class WasteDetector:
                         if len(examples) < 3:
                             # Get first repeated phrase as example
                             example_phrase = ' '.join(list(overlap)[0])
-                            examples.append(f"\"{example_phrase[:60]}...\" ({waste_tokens} tokens)")
+                            examples.append({
+                                'snippet': example_phrase[:60],
+                                'waste_tokens': waste_tokens
+                            })
 
                         if session["session_id"] not in affected_sessions:
                             affected_sessions.append(session["session_id"])
@@ -231,7 +234,7 @@ class WasteDetector:
                 'verbose_count': int,
                 'avg_length': int,
                 'baseline_length': int,
-                'examples': List[Tuple[str, int, int]],
+                'examples': List[Dict],
                 'recommendation': str
             }
         """